@@ -0,0 +1,52 @@
+import numpy as np
+
+# Headings are counterclockwise from the field's +y, so at heading 0 the front of the
+# robot points up the screen. Every function works on whole arrays: robots on the
+# leading axes, time steps on the last one.
+
+
+def field_to_robot(x, y, heading):
+    # what the drive code does to the stick: x cos(θ) + y sin(θ), -x sin(θ) + y cos(θ)
+    c, s = np.cos(heading), np.sin(heading)
+    return x * c + y * s, -x * s + y * c
+
+
+def robot_to_field(x, y, heading):
+    c, s = np.cos(heading), np.sin(heading)
+    return x * c - y * s, x * s + y * c
+
+
+def clip_stick(joystick):
+    # x^2 + y^2 <= 1, like the gamepad reports it
+    joystick = np.asarray(joystick, dtype=float)
+    norms = np.linalg.norm(joystick, axis=-1, keepdims=True)
+    return joystick / np.maximum(norms, 1)
+
+
+def simulate(joystick, dt, turn=None, imu=None, start=(0, 0), heading=0, speed=1, field_centric=True):
+    # joystick (..., T, 2) and either turn rates (..., T) in rad/s or IMU headings (..., T)
+    # -> poses (..., T + 1, 3) of x, y, heading; field_centric may differ per robot
+    joystick = clip_stick(joystick)
+    if imu is not None:
+        # the reading the drive code saw on each step; the pose after it keeps it
+        during = np.broadcast_to(np.asarray(imu, dtype=float), joystick.shape[:-1])
+        headings = np.concatenate([during[..., :1], during], axis=-1)
+    else:
+        turn = np.zeros(joystick.shape[:-1]) if turn is None else np.broadcast_to(turn, joystick.shape[:-1])
+        start_heading = np.asarray(heading, dtype=float)[..., None]
+        headings = start_heading + np.concatenate([np.zeros(turn.shape[:-1] + (1,)), np.cumsum(turn * dt, axis=-1)], axis=-1)
+        during = headings[..., :-1]
+    x, y = joystick[..., 0], joystick[..., 1]
+    # field centric drive turns the stick into robot frame wheel commands, robot
+    # centric drive passes it straight through
+    centric = np.asarray(field_centric, dtype=bool)[..., None]
+    fx, fy = field_to_robot(x, y, during)
+    command_x, command_y = np.where(centric, fx, x), np.where(centric, fy, y)
+    # the wheels push in the robot's own frame
+    vx, vy = robot_to_field(command_x, command_y, during)
+    velocity = speed * np.stack([vx, vy], axis=-1)
+    origin = np.asarray(start, dtype=float)[..., None, :]
+    travelled = np.cumsum(velocity * dt, axis=-2)
+    positions = origin + np.concatenate([np.zeros_like(travelled[..., :1, :]), travelled], axis=-2)
+    return np.concatenate([positions, headings[..., None]], axis=-1)
+
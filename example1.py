@@ -1,6 +1,7 @@
 #kept in a seperate file as the code for these scenes are huge
 from manim import *
 from math import sin, cos, radians
+from rendering.reactive import bind, redraw, set_line
 
 class RotationMatrix(Scene):
     def construct(self):
@@ -79,17 +80,21 @@ class ExplainXAndY(Scene):
                 sin(theta.get_value()) * radius
             ]
 
-        hyp = always_redraw(
-            lambda: Line(plane_origin, plane.c2p(*get_x_and_y()))
+        hyp = bind(
+            Line(), [theta],
+            lambda m: set_line(m, plane_origin, plane.c2p(*get_x_and_y()))
         )
-        base_x = always_redraw(
-            lambda: Line(plane_origin, plane.c2p(get_x_and_y()[0], 0))
+        base_x = bind(
+            Line(), [theta],
+            lambda m: set_line(m, plane_origin, plane.c2p(get_x_and_y()[0], 0))
         )
-        base_y = always_redraw(
-            lambda: Line(plane.c2p(get_x_and_y()[0], 0), plane.c2p(*get_x_and_y()))
+        base_y = bind(
+            Line(), [theta],
+            lambda m: set_line(m, plane.c2p(get_x_and_y()[0], 0), plane.c2p(*get_x_and_y()))
         )
-        y_height = always_redraw(
-            lambda: DashedLine(plane.c2p(0,get_x_and_y()[1]), plane.c2p(*get_x_and_y()))
+        y_height = redraw(
+            lambda: DashedLine(plane.c2p(0,get_x_and_y()[1]), plane.c2p(*get_x_and_y())),
+            [theta]
         )
 
         def dot():
@@ -98,9 +103,10 @@ class ExplainXAndY(Scene):
                 Tex("Joystick Position").scale(0.8).next_to(d,UR)
             )
             return d
-        d = always_redraw(dot)
+        # moving the dot carries its label along
+        d = bind(dot(), [theta], lambda m: m.shift(plane.c2p(*get_x_and_y()) - m.get_arc_center()))
 
-        arc = always_redraw(
+        arc = redraw(
             lambda: Angle.from_three_points(
                 plane.c2p(get_x_and_y()[0]),
                 plane_origin,
@@ -109,19 +115,22 @@ class ExplainXAndY(Scene):
                     plane.c2p(*get_x_and_y()),
                     plane_origin,
                     plane.c2p(get_x_and_y()[0])
-                )
+                ),
+            [theta]
         )
         show_func = ValueTracker(False)
-        label = always_redraw(
-            lambda: MathTex(r"\alpha").next_to(arc, UR+DOWN*0.75, buff=0.1) if theta.get_value()<radians(90) else
-            MathTex(r"\alpha").next_to(arc, UL+DOWN*0.75, buff=0.1)
-        )
-        x_label = always_redraw(
-            lambda: MathTex("x").next_to(base_y, DOWN) if not show_func.get_value() else MathTex(r"\cos(\alpha)").next_to(base_y, DOWN)
-        )
-        y_label = always_redraw(
-            lambda: MathTex("y").next_to(y_height, LEFT) if not show_func.get_value() else MathTex(r"\sin(\alpha)").next_to(y_height,LEFT)
+        label = bind(
+            MathTex(r"\alpha"), [theta, arc],
+            lambda m: m.next_to(arc, UR+DOWN*0.75, buff=0.1) if theta.get_value()<radians(90) else
+            m.next_to(arc, UL+DOWN*0.75, buff=0.1)
         )
+        # the text only changes with show_func, every other frame the label is just moved
+        x_texts = [MathTex("x"), MathTex(r"\cos(\alpha)")]
+        y_texts = [MathTex("y"), MathTex(r"\sin(\alpha)")]
+        x_label = bind(x_texts[0].copy(), [show_func], lambda m: m.become(x_texts[int(show_func.get_value())]))
+        y_label = bind(y_texts[0].copy(), [show_func], lambda m: m.become(y_texts[int(show_func.get_value())]))
+        bind(x_label, [base_y, show_func], lambda m: m.next_to(base_y, DOWN))
+        bind(y_label, [y_height, show_func], lambda m: m.next_to(y_height, LEFT))
 
         self.play(Create(c))
         self.play(Create(hyp), Create(base_x), Create(base_y), Create(arc), Create(label), Create(d))
@@ -171,7 +180,7 @@ class RobotLinearTransformationPi(LinearTransformationScene):
         self.radians = theta
 
     def construct(self):
-        self.radians = self.radians if self.radians else radians(90)
+        self.radians = self.radians if self.radians is not None else radians(90)
         c2p = self.background_plane.c2p
         robot = Square().rotate(self.radians, about_point=c2p(0,0))
         robot_vec = Vector([0, 2], color=PINK).rotate(self.radians, about_point=c2p(0,0))
@@ -0,0 +1,53 @@
+import numpy as np
+
+# km/s; the ToF scene rounds it to 300,000
+SPEED_OF_LIGHT = 299792.458
+
+
+def polar(radius, angle):
+    # points at radians angle counterclockwise from +x
+    angle = np.asarray(angle, dtype=float)
+    return np.stack([radius * np.cos(angle), radius * np.sin(angle), np.zeros_like(angle)], axis=-1)
+
+
+def ring(count, radius, start=90):
+    # satellites evenly spaced on a circle, the first one straight up
+    return polar(radius, np.radians(start + 360 / count * np.arange(count)))
+
+
+def distances(points, anchors):
+    # (..., 3) receivers against (k, 3) or (..., k, 3) satellites -> (..., k) ranges
+    points = np.asarray(points, dtype=float)
+    return np.linalg.norm(points[..., None, :] - np.asarray(anchors, dtype=float), axis=-1)
+
+
+def trilaterate(anchors, ranges):
+    # Subtracting the first sphere |x - a_0|^2 = r_0^2 from the others leaves the linear
+    # system 2 (a_i - a_0) . x = |a_i|^2 - |a_0|^2 - (r_i^2 - r_0^2), solved in the least
+    # squares sense. Fixed satellites share one pseudo-inverse across every receiver;
+    # with coplanar satellites the answer stays in their plane.
+    anchors = np.asarray(anchors, dtype=float)
+    ranges = np.asarray(ranges, dtype=float)
+    squares = np.sum(anchors**2, axis=-1)
+    rhs = (squares[..., 1:] - squares[..., :1]) - (ranges[..., 1:] ** 2 - ranges[..., :1] ** 2)
+    a = 2 * (anchors[..., 1:, :] - anchors[..., :1, :])
+    if anchors.ndim == 2:
+        return rhs @ np.linalg.pinv(a).T
+    # satellites that move with each sample: one small system per sample
+    return np.squeeze(np.linalg.pinv(a) @ rhs[..., None], axis=-1)
+
+
+def law_of_cosines_angle(a, b, c):
+    # L = arccos((a^2 + b^2 - c^2) / 2ab), the angle opposite c
+    a, b, c = (np.asarray(x, dtype=float) for x in (a, b, c))
+    return np.arccos(np.clip((a**2 + b**2 - c**2) / (2 * a * b), -1, 1))
+
+
+def central_angle(earth_radius, satellite_radius, distance):
+    return law_of_cosines_angle(earth_radius, satellite_radius, distance)
+
+
+def flight_distance(dt, speed=SPEED_OF_LIGHT, round_trip=True):
+    # d = 1/2 r t for an echo, d = r t one way
+    distance = speed * np.asarray(dt, dtype=float)
+    return distance / 2 if round_trip else distance
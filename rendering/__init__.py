@@ -0,0 +1,4 @@
+# render tooling for the scenes in video.py and example1.py
+from pathlib import Path
+
+STATE_DIR = Path(".render")
@@ -0,0 +1,235 @@
+# animated GIFs and video clips as image mobjects: frames are decoded in the background
+# into a raw RGBA file and shown as views of memory mappings of it, in step with scene time
+import bisect
+import hashlib
+import json
+import math
+import os
+import subprocess
+import threading
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+from manim import ImageMobject, config
+from manim.utils.bezier import interpolate
+from manim.utils.color import color_to_int_rgb
+from manim.utils.images import get_full_raster_image_path
+from PIL import Image, ImageSequence
+
+from rendering import STATE_DIR
+from rendering.ffmpeg import frame_rate, probe
+
+FRAMES_DIR = STATE_DIR / "frames"
+
+# decoded with Pillow, anything else goes through ffmpeg
+PIL_FORMATS = {".gif", ".webp", ".apng", ".png"}
+
+
+def pil_frames(path):
+    with Image.open(path) as image:
+        for frame in ImageSequence.Iterator(image):
+            # browsers show frames without a duration for 0.1s as well
+            yield frame.convert("RGBA").tobytes(), (frame.info.get("duration") or 100) / 1000
+
+
+def clip_frames(path, width, height, fps):
+    process = subprocess.Popen(
+        [
+            config.ffmpeg_executable,
+            "-loglevel", "error",
+            "-nostdin",
+            "-i", str(path),
+            "-f", "rawvideo",
+            "-pix_fmt", "rgba",
+            "-",
+        ],
+        stdout=subprocess.PIPE,
+    )
+    size = width * height * 4
+    try:
+        while True:
+            data = process.stdout.read(size)
+            if len(data) < size:
+                return
+            yield data, 1 / fps
+    finally:
+        process.kill()
+        process.wait()
+
+
+def _discard(path):
+    # a decode that never reached the end leaves nothing reusable behind
+    path.unlink(missing_ok=True)
+
+
+class FrameSource:
+    # One decode of a file, shared by every copy of the mobjects showing it. A
+    # finished decode is kept under .render/frames and never redone.
+
+    def __init__(self, path, window=16):
+        self.path = Path(path)
+        stat = self.path.stat()
+        key = hashlib.sha256(f"{self.path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()[:32]
+        self.raw = FRAMES_DIR / f"{key}.rgba"
+        self.index = FRAMES_DIR / f"{key}.json"
+        self.window = window
+        self.recent = OrderedDict()
+        self.condition = threading.Condition()
+        self.error = None
+        self.wanted = 0
+        if self.index.exists():
+            info = json.loads(self.index.read_text())
+            self.shape = tuple(info["shape"])
+            self.set_durations(info["durations"])
+            self.done = True
+            return
+        if self.path.suffix.lower() in PIL_FORMATS:
+            with Image.open(self.path) as image:
+                self.shape = (image.height, image.width, 4)
+            frames = pil_frames(self.path)
+        else:
+            stream = probe(self.path)
+            width, height = int(stream["width"]), int(stream["height"])
+            self.shape = (height, width, 4)
+            frames = clip_frames(self.path, width, height, frame_rate(stream))
+        self.set_durations([])
+        self.done = False
+        FRAMES_DIR.mkdir(parents=True, exist_ok=True)
+        # per process, so workers decoding the same file side by side don't collide
+        self.raw = FRAMES_DIR / f"{key}.{os.getpid()}.part"
+        weakref.finalize(self, _discard, self.raw)
+        threading.Thread(target=self.decode, args=(frames, key), daemon=True).start()
+
+    def set_durations(self, durations):
+        self.durations = list(durations)
+        self.starts = list(np.cumsum([0] + self.durations[:-1])) if self.durations else []
+        self.elapsed = float(sum(self.durations))
+
+    @property
+    def frame_bytes(self):
+        return int(np.prod(self.shape))
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def decode(self, frames, key):
+        try:
+            with open(self.raw, "wb") as f:
+                for data, duration in frames:
+                    with self.condition:
+                        # stay at most a window ahead of playback
+                        self.condition.wait_for(lambda: len(self.durations) < self.wanted + self.window)
+                    f.write(data)
+                    f.flush()
+                    with self.condition:
+                        self.starts.append(self.elapsed)
+                        self.durations.append(duration)
+                        self.elapsed += duration
+                        self.condition.notify_all()
+            final = FRAMES_DIR / f"{key}.rgba"
+            with self.condition:
+                os.replace(self.raw, final)
+                self.raw = final
+                self.index.write_text(json.dumps({"shape": list(self.shape), "durations": self.durations}))
+        except Exception as e:
+            self.error = e
+        finally:
+            with self.condition:
+                self.done = True
+                self.condition.notify_all()
+
+    def finish(self):
+        with self.condition:
+            self.wanted = math.inf
+            self.condition.notify_all()
+            self.condition.wait_for(lambda: self.done)
+            return self.elapsed
+
+    def frame_at(self, t, loop=True):
+        with self.condition:
+            while t >= self.elapsed and not self.done:
+                self.wanted = len(self.durations)
+                self.condition.notify_all()
+                self.condition.wait()
+            if self.error:
+                raise self.error
+            if not self.durations:
+                raise ValueError(f"no frames could be decoded from {self.path}")
+            if t >= self.elapsed:
+                t = t % self.elapsed if loop else self.elapsed
+            index = min(bisect.bisect_right(self.starts, t) - 1, len(self.durations) - 1)
+            self.wanted = index
+            self.condition.notify_all()
+            return self.frame(index)
+
+    def frame(self, index):
+        # only the last few frames stay mapped, the page cache holds the rest
+        frame = self.recent.pop(index, None)
+        if frame is None:
+            mapped = np.memmap(self.raw, dtype=np.uint8, mode="r", offset=index * self.frame_bytes, shape=self.shape)
+            frame = mapped.view(np.ndarray)
+        self.recent[index] = frame
+        while len(self.recent) > self.window:
+            self.recent.popitem(last=False)
+        return frame
+
+
+class AnimatedImageMobject(ImageMobject):
+    # an ImageMobject that plays its file while it is in the scene; the frames are
+    # read-only views, so colour and opacity are applied to a copy on the way in
+    def __init__(self, file_name, loop=True, speed=1.0, window=16, **kwargs):
+        self.source = FrameSource(get_full_raster_image_path(file_name), window)
+        self.loop = loop
+        self.speed = speed
+        self.time = 0
+        self.tint = None
+        super().__init__(self.source.frame_at(0, loop), **kwargs)
+        self.path = self.source.path
+        self.add_updater(AnimatedImageMobject.advance)
+
+    @property
+    def duration(self):
+        # only known once the whole file is decoded
+        return self.source.finish() / self.speed
+
+    def advance(self, dt):
+        self.time += dt * self.speed
+        self.show(self.source.frame_at(self.time, self.loop))
+
+    def show(self, frame):
+        # every new frame gets the tint and fade the mobject currently has
+        if self.tint is not None or self.fill_opacity != 1:
+            frame = np.array(frame)
+            if self.tint is not None:
+                frame[:, :, :3] = self.tint
+            if self.fill_opacity != 1:
+                # scaled, so the file's own transparent pixels stay transparent
+                frame[:, :, 3] = (frame[:, :, 3] * self.fill_opacity).astype(np.uint8)
+        self.pixel_array = frame
+
+    def interpolate_color(self, mobject1, mobject2, alpha):
+        # ImageMobject blends the two pixel arrays and the opacities; the tint has to
+        # follow as well, or the first frame after a colour animation drops it
+        super().interpolate_color(mobject1, mobject2, alpha)
+        start, end = getattr(mobject1, "tint", None), getattr(mobject2, "tint", None)
+        if start is not None and end is not None:
+            self.tint = np.round(interpolate(np.array(start), np.array(end), alpha)).astype(np.uint8)
+        else:
+            self.tint = end if alpha >= 1 else start
+
+    def set_color(self, color, alpha=None, family=True):
+        self.tint = color_to_int_rgb(color)
+        if alpha is not None:
+            self.fill_opacity = self.stroke_opacity = alpha
+        for submob in self.submobjects:
+            submob.set_color(color, alpha, family)
+        self.color = color
+        self.show(self.source.frame_at(self.time, self.loop))
+        return self
+
+    def set_opacity(self, alpha):
+        self.fill_opacity = self.stroke_opacity = alpha
+        self.show(self.source.frame_at(self.time, self.loop))
+        return self
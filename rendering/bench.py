@@ -0,0 +1,221 @@
+# renders every scene (and a few micro scenes of the known hot patterns) at fixed
+# settings and compares frames/sec, wall time, LaTeX time, peak RSS and output size
+# against a stored baseline
+import argparse
+import json
+import math
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from manim import (
+    BLUE, DEGREES, DOWN, GREEN, LEFT, MED_LARGE_BUFF, ORANGE, RED, RIGHT, TEAL, UP, UR,
+    YELLOW, Axes, DashedLine, Dot, Line, MathTex, Scene, Sphere, ThreeDScene, Transform,
+    ValueTracker,
+)
+
+from rendering import STATE_DIR
+from rendering.profile import Profiler, peak_mb
+from rendering.reactive import bind, follow, redraw, set_line
+from rendering.render import QUALITIES, render_scene
+from rendering.scenes import discover
+from rendering.trajectory import Trajectory
+
+BENCH_DIR = STATE_DIR / "bench"
+BASELINE_FILE = BENCH_DIR / "baseline.json"
+LATEST_FILE = BENCH_DIR / "latest.json"
+
+# metric -> (1 if higher is worse, -1 if lower is worse, changes smaller than this are noise)
+METRICS = {
+    "fps": (-1, 0),
+    "wall": (1, 0.1),
+    "tex": (1, 0.1),
+    "peak_mb": (1, 1),
+    "size": (1, 1024),
+}
+
+
+class BoundArm(Scene):
+    # DeltaArmDemo: follow() arms that Trajectory moves for a whole play at once, with
+    # MathTex labels bound to the arms they sit next to
+    def construct(self):
+        pos = ValueTracker(3)
+
+        def corners(pos):
+            top = LEFT + np.sqrt(20-(1+pos)**2)[:, None]*UP
+            return np.stack([np.broadcast_to(LEFT, top.shape), top, pos[:, None]*RIGHT], axis=1)
+
+        a = follow(
+            DashedLine(LEFT, pos.get_value()*RIGHT, color=RED), [pos], corners,
+            lambda m, p: m.put_start_and_end_on(p[0], p[2])
+        )
+        b = follow(Line(color=BLUE), [pos], corners, lambda m, p: set_line(m, p[0], p[1]))
+        c = follow(Line(color=GREEN), [pos], corners, lambda m, p: set_line(m, p[1], p[2]))
+        a_label = bind(MathTex("a", color=RED), [a], lambda m: m.next_to(a, DOWN))
+        b_label = bind(MathTex("b", color=BLUE), [b], lambda m: m.next_to(b, LEFT))
+        c_label = bind(MathTex("c", color=GREEN), [c], lambda m: m.next_to(c, UR, buff=-1))
+        self.add(a, b, c, a_label, b_label, c_label)
+        self.play(Trajectory({pos: 2}))
+        self.play(Trajectory({pos: 3.2}))
+
+
+class SecantGroup(Scene):
+    # the secant slope group Calculus rebuilds whenever its trackers move, and the
+    # dots bound to the axes
+    def construct(self):
+        axes = Axes(x_range=[0, 10, 1], x_length=9, y_range=[0, 20, 5], y_length=6)
+        func = axes.plot(lambda t: 2*math.sin(t)+4, x_range=[0, 10], color=TEAL)
+        x = ValueTracker(7)
+        secant = redraw(
+            lambda: axes.get_secant_slope_group(
+                x=x.get_value(), graph=func, dx=1, dx_line_color=YELLOW, dy_line_color=ORANGE,
+                dx_label="dx", dy_label="dy", secant_line_color=GREEN, secant_line_length=8,
+            ),
+            [x]
+        )
+        dot = bind(
+            Dot().scale(0.7), [x, axes],
+            lambda m: m.move_to(axes.c2p(x.get_value(), func.underlying_function(x.get_value())))
+        )
+        self.add(axes, func, secant, dot)
+        self.play(x.animate.set_value(1), run_time=2)
+
+
+class SphereRotation(ThreeDScene):
+    # SphereScene's ambient camera rotation around a Sphere
+    def construct(self):
+        self.set_camera_orientation(phi=75 * DEGREES, theta=-45 * DEGREES)
+        self.add(Sphere(radius=1.8, color=BLUE, fill_opacity=0.8))
+        self.begin_ambient_camera_rotation(rate=0.3)
+        self.wait(2)
+
+
+class ChainedTransforms(Scene):
+    # LawOfCosines rewriting one equation into the next
+    def construct(self):
+        eqs = [
+            MathTex(r"d=\sqrt{R_e^2+R_s^2-2R_eR_s\cos(L)}"),
+            MathTex(r"d^2=R_e^2+R_s^2-2R_eR_s\cos(L)"),
+            MathTex(r"d^2-R_e^2-R_s^2=-2R_eR_s\cos(L)"),
+            MathTex(r"\frac{R_e^2+R_s^2-d^2}{2R_eR_s}=\cos(L)"),
+            MathTex(r"L=\arccos(\frac{R_e^2+R_s^2-d^2}{2R_eR_s})"),
+        ]
+        for eq, below in zip(eqs[1:], eqs):
+            eq.next_to(below, DOWN, buff=MED_LARGE_BUFF)
+        self.add(eqs[0])
+        for source, target in zip(eqs, eqs[1:]):
+            self.play(Transform(source.copy(), target))
+
+
+MICRO = (BoundArm, SecantGroup, SphereRotation, ChainedTransforms)
+
+
+def measure(module, scene, quality, micro=False):
+    # cold: fresh tex and media directories, no partial movie cache
+    with tempfile.TemporaryDirectory() as work:
+        options = {
+            "media_dir": str(Path(work) / "media"),
+            "tex_dir": str(Path(work) / "tex"),
+            "disable_caching": True,
+            # micro scenes time updating and rasterizing, not ffmpeg; dry_run would skip
+            # setting up the writer's paths altogether
+            "write_to_movie": not micro,
+        }
+        profiler = Profiler(time_updaters=False)
+        with profiler.tex():
+            result = render_scene(module, scene, quality, options, prepare=profiler.install)
+        frames = sum(play["written"] for play in profiler.plays)
+        metrics = {
+            "wall": result["seconds"],
+            "frames": frames,
+            "fps": frames / result["seconds"] if result["seconds"] else 0,
+            "tex": sum(play["tex"] for play in profiler.plays),
+            "peak_mb": peak_mb(),
+        }
+        if not micro:
+            metrics["size"] = Path(result["output"]).stat().st_size
+        return metrics
+
+
+def run(module, scene, quality, micro=False, repeat=1):
+    runs = []
+    for _ in range(repeat):
+        # a process of its own per run, for a peak RSS that is the scene's alone
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            try:
+                runs.append(pool.submit(measure, module, scene, quality, micro).result())
+            except Exception as e:
+                return {"error": repr(e)}
+    return min(runs, key=lambda r: r["wall"])
+
+
+def compare(current, baseline, tolerance):
+    regressions = []
+    for name, metrics in current.items():
+        base = baseline.get(name)
+        if not base or "error" in metrics or "error" in base:
+            continue
+        for metric, (sign, noise) in METRICS.items():
+            old, new = base.get(metric), metrics.get(metric)
+            if not old or new is None or abs(new - old) <= noise:
+                continue
+            change = (new - old) / old
+            if sign * change > tolerance:
+                regressions.append({"bench": name, "metric": metric, "baseline": old, "current": new, "change": change})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every scene against a stored baseline.")
+    parser.add_argument("scenes", nargs="*", help="only these scenes (micro scenes as micro:Name)")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed relative slowdown")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per scene, the fastest counts")
+    parser.add_argument("--no-micro", action="store_true", help="skip the micro scenes")
+    parser.add_argument("--update", action="store_true", help="store the results as the new baseline")
+    args = parser.parse_args()
+
+    benches = [(scene, module, scene, False) for module, scene in discover()]
+    if not args.no_micro:
+        benches += [(f"micro:{cls.__name__}", "rendering.bench", cls.__name__, True) for cls in MICRO]
+    if args.scenes:
+        benches = [bench for bench in benches if bench[0] in args.scenes]
+
+    results = {}
+    for name, module, scene, micro in benches:
+        results[name] = run(module, scene, args.quality, micro, args.repeat)
+        metrics = results[name]
+        if "error" in metrics:
+            print(f"{name:32} {metrics['error']}")
+            continue
+        print(
+            f"{name:32} {metrics['fps']:7.1f} fps {metrics['wall']:7.2f}s wall "
+            f"{metrics['tex']:6.2f}s tex {metrics['peak_mb']:6.0f} MB"
+            + (f" {metrics['size'] / 1024:8.0f} kB" if "size" in metrics else "")
+        )
+
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    report = {"quality": args.quality, "results": results}
+    LATEST_FILE.write_text(json.dumps(report, indent=2))
+    if args.update:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"baseline written to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}, run with --update to create one")
+        return
+    baseline = json.loads(args.baseline.read_text())
+    if baseline["quality"] != args.quality:
+        parser.error(f"the baseline was taken at quality {baseline['quality']}")
+    regressions = compare(results, baseline["results"], args.tolerance)
+    for r in regressions:
+        print(f"REGRESSION {r['bench']} {r['metric']}: {r['baseline']:.3g} -> {r['current']:.3g} ({r['change']:+.0%})")
+    if regressions:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
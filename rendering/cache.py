@@ -0,0 +1,186 @@
+# content-addressed cache of rendered scenes, keyed on everything a scene's output depends on
+import argparse
+import hashlib
+import inspect
+import json
+import shutil
+import sys
+import time
+import types
+from pathlib import Path
+
+import manim
+
+from rendering import STATE_DIR
+
+CACHE_DIR = STATE_DIR / "cache"
+DEFAULT_MAX_MB = 4096
+
+
+def _code_objects(code):
+    yield code
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _code_objects(const)
+
+
+def _codes(obj):
+    functions = vars(obj).values() if inspect.isclass(obj) else [obj]
+    for value in functions:
+        value = getattr(value, "__func__", value)
+        if inspect.isfunction(value):
+            yield from _code_objects(value.__code__)
+
+
+def _defined_in(value, module):
+    return (inspect.isfunction(value) or inspect.isclass(value)) and value.__module__ == module.__name__
+
+
+def _sibling_module(value, module):
+    path = getattr(value, "__file__", None)
+    return inspect.ismodule(value) and path and Path(path).parent == Path(module.__file__).parent
+
+
+def dependencies(scene_class):
+    # the scene's own project classes plus every module-level helper they reference;
+    # helpers nested in construct() (get_x_and_y, dot, ...) are part of the class source
+    module = sys.modules[scene_class.__module__]
+    found = [cls for cls in scene_class.__mro__ if cls.__module__ == module.__name__]
+    pending = list(found)
+    while pending:
+        obj = pending.pop()
+        for code in _codes(obj):
+            for name in code.co_names:
+                value = vars(module).get(name)
+                if _sibling_module(value, module):
+                    # a project module next to the scenes (gps.py): all of its code counts
+                    candidates = [v for v in vars(value).values() if _defined_in(v, value)]
+                else:
+                    candidates = [value] if _defined_in(value, module) else []
+                for candidate in candidates:
+                    if candidate not in found:
+                        found.append(candidate)
+                        pending.append(candidate)
+    return found
+
+
+def assets(scene_class):
+    root = Path(sys.modules[scene_class.__module__].__file__).parent
+    paths = set()
+    for obj in dependencies(scene_class):
+        for code in _codes(obj):
+            for const in code.co_consts:
+                if isinstance(const, str) and len(const) < 256 and "\n" not in const:
+                    path = root / const
+                    if path.is_file():
+                        paths.add(path)
+    return sorted(paths)
+
+
+def tooling_digest():
+    # the scenes import helpers from here (follow, Trajectory, PoseTrack, ...) and every
+    # render goes through its writers and patches, so any edit to it counts
+    digest = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def scene_key(scene_class, settings):
+    digest = hashlib.sha256()
+    digest.update(tooling_digest().encode())
+    for obj in dependencies(scene_class):
+        digest.update(inspect.getsource(obj).encode())
+    for path in assets(scene_class):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    config = {"manim": manim.__version__, **settings}
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:32]
+
+
+class RenderCache:
+    def __init__(self, root=CACHE_DIR, max_mb=DEFAULT_MAX_MB):
+        self.root = Path(root)
+        self.index_file = self.root / "index.json"
+        self.max_bytes = max_mb * 1024 * 1024
+        if self.index_file.exists():
+            self.index = json.loads(self.index_file.read_text())
+        else:
+            self.index = {"hits": 0, "misses": 0, "scenes": {}, "entries": {}}
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_file.write_text(json.dumps(self.index, indent=2))
+
+    def _count(self, scene, outcome):
+        self.index[outcome] += 1
+        stats = self.index["scenes"].setdefault(scene, {"hits": 0, "misses": 0})
+        stats[outcome] += 1
+
+    def get(self, key, scene):
+        entry = self.index["entries"].get(key)
+        if entry is None or not (self.root / entry["file"]).exists():
+            self._count(scene, "misses")
+            self.save()
+            return None
+        entry["last_used"] = time.time()
+        self._count(scene, "hits")
+        self.save()
+        return self.root / entry["file"]
+
+    def put(self, key, scene, output):
+        output = Path(output)
+        path = self.root / f"{key}{output.suffix}"
+        self.root.mkdir(parents=True, exist_ok=True)
+        # a copy, not a link: ffmpeg rewrites the media file in place on the next render
+        shutil.copyfile(output, path)
+        self.index["entries"][key] = {
+            "scene": scene,
+            "file": path.name,
+            "size": path.stat().st_size,
+            "last_used": time.time(),
+        }
+        self.evict(keep=key)
+        self.save()
+        return path
+
+    def size(self):
+        return sum(entry["size"] for entry in self.index["entries"].values())
+
+    def evict(self, keep=None):
+        entries = self.index["entries"]
+        for key in sorted(entries, key=lambda k: entries[k]["last_used"]):
+            if self.size() <= self.max_bytes:
+                break
+            if key != keep:
+                (self.root / entries.pop(key)["file"]).unlink(missing_ok=True)
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        self.index = {"hits": 0, "misses": 0, "scenes": {}, "entries": {}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the render cache.")
+    parser.add_argument("command", choices=["stats", "clear"])
+    args = parser.parse_args()
+
+    cache = RenderCache()
+    if args.command == "clear":
+        cache.clear()
+        print(f"cleared {cache.root}")
+        return
+    hits, misses = cache.index["hits"], cache.index["misses"]
+    total = hits + misses
+    print(
+        f"{len(cache.index['entries'])} entries, {cache.size() / 1024 / 1024:.1f} MB; "
+        f"{hits} hits, {misses} misses ({hits / total if total else 0:.0%} hit rate)"
+    )
+    for scene, stats in sorted(cache.index["scenes"].items()):
+        print(f"  {scene:32} {stats['hits']:5} hits {stats['misses']:5} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# renders one long scene as several chunks split at play() boundaries, on local
+# worker processes or through a job queue directory shared with other machines
+import argparse
+import json
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from rendering import STATE_DIR
+from rendering.ffmpeg import concat
+from rendering.render import QUALITIES, render_scene
+from rendering.scenes import discover
+from rendering.timeline import probe, state_digest
+
+CHUNKS_DIR = STATE_DIR / "chunks"
+QUEUE_DIR = STATE_DIR / "queue"
+
+
+def plan(plays, count):
+    # contiguous (first, last) play ranges of about equal duration; last=None runs to the end
+    total = sum(play["duration"] for play in plays)
+    chunks, first, elapsed = [], 0, 0
+    for play in plays[:-1]:
+        elapsed += play["duration"]
+        # upto_animation_number=0 means "no limit", so the first chunk can't stop at play 0
+        if play["index"] >= 1 and elapsed >= total * (len(chunks) + 1) / count:
+            chunks.append((first, play["index"]))
+            first = play["index"] + 1
+    chunks.append((first, None))
+    return chunks
+
+
+def checkpoint(first, state):
+    # A Python construct() can't be resumed from a pickled snapshot, so a chunk gets
+    # to its first play by running construct() with the earlier plays skipped. The
+    # scene state it arrives at is checked against the probe's digest of that boundary.
+    def prepare(scene):
+        renderer = scene.renderer
+        play = renderer.play
+
+        def checked_play(scene, *args, **kwargs):
+            if renderer.num_plays == first and state_digest(scene) != state:
+                raise RuntimeError(
+                    f"{type(scene).__name__} reached play {first} in a different state than "
+                    "its dry run, chunks would not line up"
+                )
+            play(scene, *args, **kwargs)
+
+        renderer.play = checked_play
+
+    return prepare
+
+
+def render_chunk(job):
+    options = {
+        "from_animation_number": job["first"],
+        "upto_animation_number": job["last"] or 0,
+        # every chunk writes its own copy of the scene's movie file
+        "media_dir": job["media_dir"],
+    }
+    try:
+        result = render_scene(
+            job["module"], job["scene"], job["quality"], options,
+            prepare=checkpoint(job["first"], job["state"]),
+        )
+    except Exception as e:
+        result = {"module": job["module"], "scene": job["scene"], "error": repr(e)}
+    return {**result, "index": job["index"]}
+
+
+class JobQueue:
+    # A directory of json jobs moved pending/ -> running/ -> done/; the rename is
+    # atomic, so any number of workers on any machine that mounts it can share it.
+    # A worker touches its running job every heartbeat seconds, and a job nobody has
+    # touched for stale seconds goes back to pending for the next worker.
+    heartbeat = 10
+    stale = 60
+
+    def __init__(self, root=QUEUE_DIR):
+        self.root = Path(root)
+        for state in ("pending", "running", "done"):
+            (self.root / state).mkdir(parents=True, exist_ok=True)
+
+    def submit(self, job):
+        name = f"{time.time_ns()}-{job['scene']}-{job['index']:03}.json"
+        temporary = self.root / f".{name}"
+        temporary.write_text(json.dumps(job))
+        os.replace(temporary, self.root / "pending" / name)
+        return name
+
+    def claim(self):
+        for path in sorted((self.root / "pending").glob("*.json")):
+            running = self.root / "running" / path.name
+            try:
+                os.rename(path, running)
+            except FileNotFoundError:
+                # another worker got there first
+                continue
+            # the rename kept the pending file's mtime, the job is alive from now
+            os.utime(running)
+            return running
+        return None
+
+    def complete(self, running, result):
+        temporary = self.root / f".{running.name}"
+        temporary.write_text(json.dumps(result))
+        os.replace(temporary, self.root / "done" / running.name)
+        # gone if this worker was taken for dead and the job requeued
+        running.unlink(missing_ok=True)
+
+    def beat(self, running, stop):
+        while not stop.wait(self.heartbeat):
+            try:
+                os.utime(running)
+            except FileNotFoundError:
+                return
+
+    def requeue_stale(self):
+        now = time.time()
+        for path in (self.root / "running").glob("*.json"):
+            try:
+                if now - path.stat().st_mtime > self.stale:
+                    os.rename(path, self.root / "pending" / path.name)
+                    print(f"requeued {path.name}, its worker stopped responding")
+            except FileNotFoundError:
+                # finished or requeued meanwhile
+                continue
+
+    def work(self, once=False, poll=1.0):
+        while True:
+            running = self.claim()
+            if running is None:
+                if once:
+                    return
+                time.sleep(poll)
+                continue
+            job = json.loads(running.read_text())
+            print(f"{socket.gethostname()}: {job['scene']} chunk {job['index']}")
+            stop = threading.Event()
+            threading.Thread(target=self.beat, args=(running, stop), daemon=True).start()
+            try:
+                result = render_chunk(job)
+            finally:
+                stop.set()
+            self.complete(running, result)
+
+    def wait(self, names, poll=1.0):
+        done = self.root / "done"
+        while not all((done / name).exists() for name in names):
+            self.requeue_stale()
+            time.sleep(poll)
+        results = [json.loads((done / name).read_text()) for name in names]
+        for name in names:
+            (done / name).unlink()
+        return results
+
+
+def render_chunked(module, scene, quality="h", count=None, jobs=None, queue=None):
+    start = time.perf_counter()
+    plays = probe(module, scene, quality)
+    chunks = plan(plays, count or os.cpu_count()) if plays else [(0, None)]
+    root = (queue.root / "media" if queue else CHUNKS_DIR) / scene
+    work = [
+        {
+            "module": module, "scene": scene, "quality": quality, "index": index,
+            "first": first, "last": last, "state": plays[first]["state"] if plays else None,
+            "media_dir": str((root / f"{index:03}").resolve()),
+        }
+        for index, (first, last) in enumerate(chunks)
+    ]
+    if queue:
+        results = queue.wait([queue.submit(job) for job in work])
+    else:
+        with ProcessPoolExecutor(max_workers=jobs or len(work)) as pool:
+            results = list(pool.map(render_chunk, work))
+    results.sort(key=lambda r: r["index"])
+    failed = [r for r in results if "error" in r]
+    if failed:
+        raise RuntimeError(f"{scene} chunk {failed[0]['index']} failed: {failed[0]['error']}")
+
+    outputs = [r["output"] for r in results]
+    if len(outputs) == 1:
+        output = outputs[0]
+    else:
+        output = concat(outputs, root / f"{scene}{Path(outputs[0]).suffix}")
+    return {
+        "module": module,
+        "scene": scene,
+        "output": str(output),
+        "chunks": results,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render one scene as chunks in parallel.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    render = commands.add_parser("render", help="split a scene and render its chunks")
+    render.add_argument("scene")
+    render.add_argument("-q", "--quality", choices=QUALITIES, default="h")
+    render.add_argument("-n", "--chunks", type=int, help="number of chunks (default: one per core)")
+    render.add_argument("-j", "--jobs", type=int, help="local worker processes")
+    render.add_argument("--queue", type=Path, help="hand the chunks to workers polling this directory")
+    worker = commands.add_parser("worker", help="render chunks from a queue directory")
+    worker.add_argument("--queue", type=Path, default=QUEUE_DIR)
+    worker.add_argument("--once", action="store_true", help="exit when the queue is empty")
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        JobQueue(args.queue).work(once=args.once)
+        return
+    modules = {name: module for module, name in discover()}
+    if args.scene not in modules:
+        parser.error(f"unknown scene {args.scene}")
+    queue = JobQueue(args.queue) if args.queue else None
+    result = render_chunked(modules[args.scene], args.scene, args.quality, args.chunks, args.jobs, queue)
+    print(f"{args.scene}: {result['output']} ({len(result['chunks'])} chunks, {result['seconds']:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# a long-lived render server: manim, numpy and Cairo are imported once and forked into a
+# pool of warm workers; a thin client sends it jobs over a Unix socket
+import argparse
+import importlib
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from rendering import STATE_DIR
+
+# manim is only imported on the server side, so the client starts instantly
+
+SOCKET_FILE = STATE_DIR / "daemon.sock"
+
+
+class RenderServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, jobs=None):
+        from rendering.scenes import MODULES
+
+        self.modules = MODULES
+        self.jobs = jobs or os.cpu_count()
+        self.lock = threading.Lock()
+        self.pool = None
+        self.mtimes = None
+        self.reload()
+        super().__init__(str(path), RenderHandler)
+
+    def source_mtimes(self):
+        return {
+            name: os.stat(importlib.import_module(name).__file__).st_mtime_ns
+            for name in self.modules
+        }
+
+    def reload(self):
+        from rendering.scenes import discover
+
+        mtimes = self.source_mtimes()
+        if mtimes == self.mtimes:
+            return
+        if self.mtimes is not None:
+            for name in self.modules:
+                importlib.reload(sys.modules[name])
+            print(f"reloaded {', '.join(self.modules)}", flush=True)
+        self.scenes = {scene: module for module, scene in discover(self.modules)}
+        self.start_pool()
+        self.mtimes = mtimes
+
+    def start_pool(self):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Forking this process once the handler threads run could copy a lock one of
+        # them holds, so workers come from a forkserver: a clean process that imports
+        # manim once and forks a worker per slot. The scene modules aren't preloaded,
+        # every new pool imports their current code.
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["manim", "rendering.render"])
+        old = self.pool
+        self.pool = ProcessPoolExecutor(self.jobs, mp_context=context)
+        list(self.pool.map(warm, [self.modules] * self.jobs))
+        if old:
+            # jobs already running on the old workers still finish and reply
+            old.shutdown(wait=False)
+
+    def submit(self, request):
+        from rendering.render import render_scene
+
+        with self.lock:
+            self.reload()
+            scene = request["scene"]
+            if scene not in self.scenes:
+                return None
+            args = (render_scene, self.scenes[scene], scene, request.get("quality", "h"), request.get("options"))
+            try:
+                return self.pool.submit(*args)
+            except BrokenProcessPool:
+                self.start_pool()
+                return self.pool.submit(*args)
+
+    def restart_if_broken(self):
+        # a worker died (segfault, OOM kill) and took the pool with it; a pool that was
+        # already replaced, or another job's crash, leaves nothing to do
+        with self.lock:
+            try:
+                self.pool.submit(os.getpid)
+            except BrokenProcessPool:
+                print("a worker died, restarting the pool", flush=True)
+                self.start_pool()
+
+
+class RenderHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                future = self.server.submit(request)
+                if future is None:
+                    reply = {"error": f"unknown scene {request['scene']}"}
+                else:
+                    reply = future.result()
+            except BrokenProcessPool as e:
+                self.server.restart_if_broken()
+                reply = {"error": repr(e)}
+            except Exception as e:
+                reply = {"error": repr(e)}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+            self.wfile.flush()
+
+
+def warm(modules):
+    # makes the pool start its workers now rather than on the first job, and pays for
+    # the scene imports and the default tex template before any job does
+    from manim import config
+
+    for name in modules:
+        importlib.import_module(name)
+    config.tex_template
+    return os.getpid()
+
+
+def serve(path=SOCKET_FILE, jobs=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        try:
+            with socket.socket(socket.AF_UNIX) as probe:
+                probe.connect(str(path))
+        except OSError:
+            # left behind by a server that didn't shut down cleanly
+            path.unlink()
+        else:
+            raise SystemExit(f"a render daemon is already listening on {path}")
+    server = RenderServer(path, jobs)
+    print(f"listening on {path} with {server.jobs} workers", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+        server.pool.shutdown(cancel_futures=True)
+
+
+def request(scene, quality="h", path=SOCKET_FILE):
+    with socket.socket(socket.AF_UNIX) as client:
+        client.connect(str(path))
+        client.sendall(json.dumps({"scene": scene, "quality": quality}).encode() + b"\n")
+        with client.makefile() as replies:
+            return json.loads(replies.readline())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render scenes through a warm render daemon.")
+    parser.add_argument("--socket", type=Path, default=SOCKET_FILE)
+    commands = parser.add_subparsers(dest="command", required=True)
+    start = commands.add_parser("serve", help="start the daemon in the foreground")
+    start.add_argument("-j", "--jobs", type=int, help="worker processes (default: one per core)")
+    render = commands.add_parser("render", help="render scenes on a running daemon")
+    render.add_argument("scenes", nargs="+")
+    render.add_argument("-q", "--quality", choices=list("lmhpk"), default="h")
+    args = parser.parse_args()
+
+    path = args.socket
+    if args.command == "serve":
+        serve(path, args.jobs)
+        return
+    # one connection per scene, so the daemon renders them side by side
+    replies = {}
+    threads = [
+        threading.Thread(target=lambda s=s: replies.__setitem__(s, request(s, args.quality, path)))
+        for s in args.scenes
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    failed = False
+    for scene in args.scenes:
+        reply = replies[scene]
+        if "error" in reply:
+            failed = True
+            print(f"{scene}: {reply['error']}")
+        else:
+            print(f"{scene}: {reply['output']} ({reply['seconds']:.1f}s)")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# restores the cached background only where the last frame drew moving mobjects
+import numpy as np
+from manim.camera.camera import Camera
+
+# past this share of the frame a plain full copy is as cheap
+FULL_COPY_AREA = 0.5
+
+
+class DirtyRegionCamera(Camera):
+    # CairoRenderer.update_frame copies the whole static image over the frame and
+    # draws the moving mobjects on top. Everything outside the boxes drawn into
+    # during the previous frame still equals that image, so only those are restored.
+
+    def reset(self):
+        # scenes without static mobjects are reset to the plain background instead
+        self.set_frame_to_background(self.background)
+        return self
+
+    def set_frame_to_background(self, background):
+        drawn = getattr(self, "drawn", None)
+        if (
+            drawn is None
+            or background is not getattr(self, "restored_from", None)
+            or background.shape != self.pixel_array.shape
+        ):
+            super().set_frame_to_background(background)
+        else:
+            for x0, y0, x1, y1 in drawn:
+                self.pixel_array[y0:y1, x0:x1] = background[y0:y1, x0:x1]
+        self.restored_from = background
+        self.drawn = []
+
+    def capture_mobjects(self, mobjects, **kwargs):
+        if self.drawn is not None:
+            self.drawn += filter(None, (self.pixel_box(m) for m in mobjects))
+            area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in self.drawn)
+            if area > FULL_COPY_AREA * self.pixel_width * self.pixel_height:
+                self.drawn = None
+        super().capture_mobjects(mobjects, **kwargs)
+
+    def pixel_box(self, mobject):
+        family = [m for m in mobject.get_family() if len(m.points)]
+        if not family:
+            return None
+        points = np.concatenate([m.points for m in family])
+        corners = self.points_to_pixel_coords(mobject, np.array([points.min(0), points.max(0)]))
+        # strokes are centred on the path: widths are in hundredths of a frame unit
+        stroke = max(
+            max(getattr(m, "stroke_width", 0) or 0, getattr(m, "background_stroke_width", 0) or 0)
+            for m in family
+        )
+        pad = int(np.ceil(stroke * 0.01 * self.pixel_width / self.frame_width)) + 2
+        x0, x1 = sorted(corners[:, 0])
+        y0, y1 = sorted(corners[:, 1])
+        x0, y0 = max(x0 - pad, 0), max(y0 - pad, 0)
+        x1, y1 = min(x1 + pad + 1, self.pixel_width), min(y1 + pad + 1, self.pixel_height)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return x0, y0, x1, y1
+
+
+def install(scene):
+    # only scenes on the default camera, ThreeDScene and MovingCameraScene keep theirs
+    renderer = scene.renderer
+    if type(renderer.camera) is Camera:
+        renderer.camera = DirtyRegionCamera()
+    return renderer.camera
@@ -0,0 +1,132 @@
+# assembles the episode from the per-scene outputs in the order of episode.json, by
+# stream copy only: a changed scene swaps its segment in and the container is rewritten
+import argparse
+import hashlib
+import json
+import subprocess
+from pathlib import Path
+
+from manim import config
+from manim.constants import QUALITIES as QUALITY_SETTINGS
+
+from rendering import STATE_DIR
+from rendering.cache import DEFAULT_MAX_MB, RenderCache
+from rendering.ffmpeg import concat, probe
+from rendering.render import QUALITIES
+from rendering.render_all import render_all
+from rendering.scenes import discover
+
+MANIFEST_FILE = Path("episode.json")
+EPISODE_DIR = STATE_DIR / "episode"
+STATE_FILE = EPISODE_DIR / "state.json"
+# with the rest of the render state, out of the source tree
+OUTPUT_FILE = EPISODE_DIR / "episode.mp4"
+
+# what has to agree between segments for the concat demuxer to copy them
+CODEC_FIELDS = "stream=codec_name,profile,width,height,pix_fmt,r_frame_rate,time_base"
+
+
+def load_manifest(path=MANIFEST_FILE):
+    manifest = json.loads(Path(path).read_text())
+    modules = {name: module for module, name in discover()}
+    unknown = [scene for scene in manifest["scenes"] if scene not in modules]
+    if unknown:
+        raise SystemExit(f"{path}: unknown scenes {', '.join(unknown)}")
+    manifest["scenes"] = [(modules[scene], scene) for scene in manifest["scenes"]]
+    return manifest
+
+
+def fingerprint(path, *extra):
+    stat = Path(path).stat()
+    return hashlib.sha256(repr((str(path), stat.st_size, stat.st_mtime_ns, *extra)).encode()).hexdigest()[:32]
+
+
+def still_segment(image, seconds, quality, timescale=None):
+    # title cards render as a png; they become a clip encoded like the scenes around them
+    settings = QUALITY_SETTINGS[QUALITIES[quality]]
+    segment = EPISODE_DIR / "stills" / f"{fingerprint(image, seconds, quality, timescale)}.mp4"
+    if segment.exists():
+        return segment
+    segment.parent.mkdir(parents=True, exist_ok=True)
+    partial = segment.with_suffix(".part.mp4")
+    subprocess.run(
+        [
+            config.ffmpeg_executable,
+            "-y",
+            "-loop", "1",
+            "-framerate", str(settings["frame_rate"]),
+            "-i", str(image),
+            "-t", str(seconds),
+            "-vf", f"scale={settings['pixel_width']}:{settings['pixel_height']}",
+            "-loglevel", "error",
+            "-nostdin",
+            "-vcodec", "libx264",
+            "-pix_fmt", "yuv420p",
+            # the mp4 time base has to match the scenes' for the concat to copy
+            *(["-video_track_timescale", str(timescale)] if timescale else []),
+            str(partial),
+        ],
+        check=True,
+    )
+    partial.replace(segment)
+    return segment
+
+
+def check_codecs(segments):
+    params = {segment: probe(segment, CODEC_FIELDS) for segment in segments}
+    reference = params[segments[0]]
+    mismatched = [
+        f"{segment}: {', '.join(f'{k}={v} (expected {reference.get(k)})' for k, v in p.items() if reference.get(k) != v)}"
+        for segment, p in params.items() if p != reference
+    ]
+    if mismatched:
+        raise SystemExit("segments can't be stream copied together:\n  " + "\n  ".join(mismatched))
+
+
+def assemble(manifest, jobs=None, cache=None):
+    quality = manifest.get("quality", "h")
+    report = render_all(manifest["scenes"], quality, jobs, cache)
+    failed = [r["scene"] for r in report["scenes"] if "error" in r]
+    if failed:
+        raise SystemExit(f"not assembled, failed scenes: {', '.join(failed)}")
+
+    outputs = [Path(result["output"]) for result in report["scenes"]]
+    movies = [path for path in outputs if path.suffix != ".png"]
+    timescale = probe(movies[0], CODEC_FIELDS)["time_base"].split("/")[1] if movies else None
+    segments = [
+        still_segment(path, manifest.get("still_seconds", 3), quality, timescale) if path.suffix == ".png" else path
+        for path in outputs
+    ]
+    fingerprints = [fingerprint(segment) for segment in segments]
+
+    output = Path(manifest.get("output", OUTPUT_FILE))
+    state = json.loads(STATE_FILE.read_text()) if STATE_FILE.exists() else {}
+    if state.get("output") == str(output) and state.get("segments") == fingerprints and output.exists():
+        return output, []
+    changed = [
+        scene for (_, scene), new, old in zip(manifest["scenes"], fingerprints, state.get("segments") or [None] * len(fingerprints))
+        if new != old
+    ]
+    check_codecs(segments)
+    concat(segments, output)
+    EPISODE_DIR.mkdir(parents=True, exist_ok=True)
+    STATE_FILE.write_text(json.dumps({"output": str(output), "segments": fingerprints}, indent=2))
+    return output, changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assemble the episode from its scenes without re-encoding.")
+    parser.add_argument("--manifest", type=Path, default=MANIFEST_FILE)
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes for scenes that need rendering")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_MB, help="cache size limit in MB")
+    args = parser.parse_args()
+
+    output, changed = assemble(load_manifest(args.manifest), args.jobs, RenderCache(max_mb=args.cache_size))
+    if changed:
+        print(f"{output}: swapped in {', '.join(changed)}")
+    else:
+        print(f"{output}: up to date")
+
+
+if __name__ == "__main__":
+    main()
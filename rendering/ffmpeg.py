@@ -0,0 +1,61 @@
+# ffmpeg helpers shared by the render tools
+import json
+import subprocess
+from pathlib import Path
+
+from manim import config
+
+
+def concat(inputs, output):
+    # stream copy: every piece comes out of the same encoder settings, so nothing is re-encoded
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    listing = output.with_suffix(".txt")
+    listing.write_text(
+        "".join(f"file 'file:{Path(path).resolve().as_posix()}'\n" for path in inputs),
+        encoding="utf-8",
+    )
+    subprocess.run(
+        [
+            config.ffmpeg_executable,
+            "-y",
+            "-f", "concat",
+            "-safe", "0",
+            "-i", str(listing),
+            "-loglevel", "error",
+            "-nostdin",
+            "-c", "copy",
+            str(output),
+        ],
+        check=True,
+    )
+    listing.unlink()
+    return output
+
+
+def probe(path, entries="stream=width,height,avg_frame_rate,r_frame_rate"):
+    # the first video stream's fields, as ffprobe reports them
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", entries,
+            "-of", "json",
+            str(path),
+        ],
+        capture_output=True,
+        check=True,
+    )
+    streams = json.loads(result.stdout).get("streams") or [{}]
+    return streams[0]
+
+
+def frame_rate(stream):
+    # ffprobe reports "0/0" as the average of streams it can't time (some MKV and
+    # raw streams); the container's base rate is the next best guess
+    for field in ("avg_frame_rate", "r_frame_rate"):
+        numerator, _, denominator = stream.get(field, "0/0").partition("/")
+        if float(numerator) and float(denominator or 1):
+            return float(numerator) / float(denominator or 1)
+    raise ValueError(f"ffprobe reported no frame rate: {stream}")
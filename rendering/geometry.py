@@ -0,0 +1,159 @@
+# on-disk store of parsed vector geometry: one flat .npy per entry, memory mapped
+# copy-on-write so every render process shares the pages until it moves something
+import hashlib
+import json
+import os
+import tempfile
+
+import manim
+import numpy as np
+from manim.mobject.svg import svg_mobject
+from manim.mobject.svg.svg_mobject import SVGMobject, VMobjectFromSVGPath
+from manim.mobject.types.vectorized_mobject import VMobject
+from manim.utils.iterables import hash_obj
+
+from rendering import STATE_DIR
+from rendering.cache import DEFAULT_MAX_MB
+
+GEOMETRY_DIR = STATE_DIR / "geometry"
+
+# scalar style a parsed submobject carries next to its arrays
+STYLE = ("stroke_width", "fill_opacity", "stroke_opacity")
+
+
+class GeometryStore:
+    # Capped like RenderCache: once the entries outgrow max_mb, the least recently used
+    # go first. A load touches the entry's index file, so the index mtimes order them
+    # across every process sharing the directory.
+    def __init__(self, root=GEOMETRY_DIR, max_mb=DEFAULT_MAX_MB):
+        self.root = root
+        self.max_bytes = max_mb * 1024 * 1024
+
+    def key(self, *parts):
+        digest = hashlib.sha256(manim.__version__.encode())
+        for part in parts:
+            digest.update(part if isinstance(part, bytes) else repr(part).encode())
+        return digest.hexdigest()[:32]
+
+    def load(self, key):
+        # the arrays come back as views into one mapping of the file
+        try:
+            info = json.loads((self.root / f"{key}.json").read_text())
+            data = np.load(self.root / f"{key}.npy", mmap_mode="c") if info["size"] else np.zeros(0)
+            data = data.view(np.ndarray)
+            os.utime(self.root / f"{key}.json")
+        except (OSError, ValueError):
+            return None
+        arrays = []
+        offset = 0
+        for shape in info["shapes"]:
+            size = int(np.prod(shape))
+            arrays.append(data[offset:offset + size].reshape(shape))
+            offset += size
+        return arrays, info["meta"]
+
+    def save(self, key, arrays, meta):
+        self.root.mkdir(parents=True, exist_ok=True)
+        flat = [np.asarray(a, dtype=float).ravel() for a in arrays]
+        data = np.concatenate(flat) if flat else np.zeros(0)
+        info = {"size": len(data), "shapes": [list(np.shape(a)) for a in arrays], "meta": meta}
+        # the data lands before its index, so a readable index always has its data
+        self._replace(f"{key}.npy", lambda f: np.save(f, data))
+        self._replace(f"{key}.json", lambda f: f.write(json.dumps(info).encode()))
+        self.evict(keep=key)
+
+    def evict(self, keep=None):
+        entries = []
+        for index in self.root.glob("*.json"):
+            try:
+                size = index.stat().st_size + (self.root / f"{index.stem}.npy").stat().st_size
+                entries.append((index.stat().st_mtime, index.stem, size))
+            except FileNotFoundError:
+                # evicted by another process meanwhile
+                continue
+        total = sum(size for *_, size in entries)
+        for _, key, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if key != keep:
+                # the index goes first, so a readable index always has its data; a
+                # process that mapped the data keeps its pages
+                for suffix in (".json", ".npy"):
+                    (self.root / f"{key}{suffix}").unlink(missing_ok=True)
+                total -= size
+
+    def _replace(self, name, write):
+        fd, temp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(temp, self.root / name)
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+
+class CachedSVGPath(VMobjectFromSVGPath):
+    # a path read back from the store: the points are assigned, not parsed
+    def __init__(self, **kwargs):
+        self.path_obj = None
+        self.long_lines = False
+        self.should_subdivide_sharp_curves = False
+        self.should_remove_null_curves = False
+        VMobject.__init__(self, **kwargs)
+
+    def init_points(self):
+        pass
+
+    generate_points = init_points
+
+
+def _record(mobjects):
+    arrays, meta = [], []
+    for mob in mobjects:
+        arrays += [mob.points, mob.fill_rgbas, mob.stroke_rgbas]
+        meta.append({
+            "path": isinstance(mob, VMobjectFromSVGPath),
+            **{name: getattr(mob, name, None) for name in STYLE},
+        })
+    return arrays, meta
+
+
+def _restore(arrays, meta):
+    mobjects = []
+    for i, style in enumerate(meta):
+        # fraction bars and rules come out of dvisvgm as rects, they only need their points
+        mob = CachedSVGPath() if style["path"] else VMobject()
+        mob.points, mob.fill_rgbas, mob.stroke_rgbas = arrays[3 * i:3 * i + 3]
+        for name in STYLE:
+            if style[name] is not None:
+                setattr(mob, name, style[name])
+        mobjects.append(mob)
+    return mobjects
+
+
+def install(store=None):
+    # SVGMobject (and so every Tex and MathTex) reads its parsed submobjects from the
+    # store when the same file was parsed with the same settings before
+    if getattr(SVGMobject.init_svg_mobject, "store", None):
+        return SVGMobject.init_svg_mobject.store
+    store = store or GeometryStore()
+    parse = SVGMobject.init_svg_mobject
+
+    def init_svg_mobject(self, use_svg_cache):
+        if not use_svg_cache or hash_obj(self.hash_seed) in svg_mobject.SVG_HASH_TO_MOB_MAP:
+            return parse(self, use_svg_cache)
+        path = self.get_file_path()
+        key = store.key(type(self).__name__, self.svg_default, self.path_string_config,
+                        manim.config.renderer, path.read_bytes())
+        loaded = store.load(key)
+        if loaded is None:
+            parse(self, use_svg_cache)
+            store.save(key, *_record(self.submobjects))
+            return
+        # every load is a private mapping, so moving one MathTex never moves another
+        self.add(*_restore(*loaded))
+
+    init_svg_mobject.store = store
+    SVGMobject.init_svg_mobject = init_svg_mobject
+    return store
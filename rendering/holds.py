@@ -0,0 +1,112 @@
+# encodes static holds by having ffmpeg repeat a single frame instead of piping every copy of it
+import subprocess
+
+from manim import __version__, config
+from manim.constants import RendererType
+from manim.scene.scene_file_writer import SceneFileWriter
+from manim.utils.file_ops import is_webm_format, write_to_movie
+
+
+class HoldFileWriter(SceneFileWriter):
+    # The renderer already rasterizes a frozen wait only once (Scene.should_update_mobjects),
+    # then hands the very same frame object to write_frame once per frame of the hold.
+    # Runs of that object are counted here, and the ffmpeg pipe is opened lazily so a
+    # partial movie that starts with a run gets a loop filter instead of N raw frames.
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        self.writing = write_to_movie() and allow_write and config.renderer == RendererType.CAIRO
+        if not self.writing:
+            return super().begin_animation(allow_write, file_path)
+        self.pipe_path = file_path
+        self.pipe_open = False
+        self.held_frame = None
+        self.held_count = 0
+
+    def write_frame(self, frame_or_renderer):
+        if not getattr(self, "writing", False):
+            return super().write_frame(frame_or_renderer)
+        if frame_or_renderer is self.held_frame:
+            self.held_count += 1
+            return
+        self.flush_held_frame()
+        self.held_frame = frame_or_renderer
+        self.held_count = 1
+
+    def flush_held_frame(self):
+        if self.held_frame is None:
+            return
+        if self.pipe_open:
+            for _ in range(self.held_count):
+                self.write_raw_frame(self.held_frame)
+        else:
+            self.open_movie_pipe(self.pipe_path, repeat=self.held_count)
+            self.write_raw_frame(self.held_frame)
+        self.held_frame = None
+        self.held_count = 0
+
+    def write_raw_frame(self, frame):
+        self.writing_process.stdin.write(frame.tobytes())
+
+    def end_animation(self, allow_write=False):
+        if not self.writing:
+            return super().end_animation(allow_write)
+        self.flush_held_frame()
+        if not self.pipe_open:
+            self.open_movie_pipe(self.pipe_path)
+        self.close_movie_pipe()
+        self.writing = False
+
+    def open_movie_pipe(self, file_path=None, repeat=1):
+        if file_path is None:
+            file_path = self.partial_movie_files[self.renderer.num_plays]
+        self.partial_movie_file_path = file_path
+        command = self.movie_pipe_command(file_path, repeat)
+        self.writing_process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        self.pipe_open = True
+
+    def close_movie_pipe(self):
+        super().close_movie_pipe()
+        self.pipe_open = False
+
+    def video_filters(self, repeat):
+        if repeat <= 1:
+            return []
+        return [f"loop=loop={repeat - 1}:size=1:start=0", "setpts=N/FRAME_RATE/TB"]
+
+    def input_args(self):
+        # the same encoder settings as SceneFileWriter.open_movie_pipe
+        fps = config["frame_rate"]
+        if fps == int(fps):
+            fps = int(fps)
+        return [
+            config.ffmpeg_executable,
+            "-y",
+            "-f", "rawvideo",
+            "-s", "%dx%d" % (config["pixel_width"], config["pixel_height"]),
+            "-pix_fmt", "rgba",
+            "-r", str(fps),
+            "-i", "-",
+            "-an",
+            "-loglevel", config["ffmpeg_loglevel"].lower(),
+            "-metadata", f"comment=Rendered with Manim Community v{__version__}",
+        ]
+
+    def codec_args(self):
+        if is_webm_format():
+            return ["-vcodec", "libvpx-vp9", "-auto-alt-ref", "0"]
+        if config["transparent"]:
+            return ["-vcodec", "qtrle"]
+        return ["-vcodec", "libx264", "-pix_fmt", "yuv420p"]
+
+    def movie_pipe_command(self, file_path, repeat=1):
+        command = self.input_args()
+        filters = self.video_filters(repeat)
+        if filters:
+            command += ["-vf", ",".join(filters)]
+        return command + self.codec_args() + [file_path]
+
+
+def install(scene, writer_class=HoldFileWriter):
+    renderer = scene.renderer
+    renderer.file_writer = writer_class(renderer, scene.__class__.__name__)
+    return renderer.file_writer
@@ -0,0 +1,92 @@
+# renders a scene once and encodes it at several resolutions and frame rates: the single
+# ffmpeg per play splits the frames into the main output plus one scaled output per rung
+import math
+from pathlib import Path
+
+from manim import config
+
+from rendering.ffmpeg import concat
+from rendering.pipeline import PipelinedFileWriter
+
+# what gets published next to the 1080p60 master
+RUNGS = ("720p30", "480p15")
+
+
+def parse_rung(rung):
+    height, fps = rung.lower().split("p")
+    return int(height), int(fps)
+
+
+def rung_path(path, rung):
+    path = Path(path)
+    return path.with_name(f"{path.stem}.{rung[0]}p{rung[1]}{path.suffix}")
+
+
+def phase(first, fps, rung_fps):
+    # where a play's first frame falls in the repeating pattern of kept frames
+    return first % (fps // math.gcd(fps, rung_fps))
+
+
+class LadderFileWriter(PipelinedFileWriter):
+    # Lower rungs are scaled from the full resolution frames, so construct(), the
+    # updaters, LaTeX and rasterizing are paid once. A rung keeps the frames where its
+    # own frame clock ticks, counted on the frame index of the whole scene rather than
+    # of each play, so plays whose length isn't a whole number of rung frames don't
+    # drift. Each play leaves one partial file per rung next to the main one, named
+    # after the phase it was cut at.
+
+    def __init__(self, renderer, scene_name, rungs=RUNGS, **kwargs):
+        self.rungs = [parse_rung(rung) for rung in rungs]
+        self.ladder_files = []
+        # play -> index of its first frame in the scene
+        self.firsts = {}
+        super().__init__(renderer, scene_name, **kwargs)
+
+    def first_frame(self):
+        # the renderer's clock also advances over plays that are skipped or cached
+        return round(self.renderer.time * config["frame_rate"])
+
+    def rung_partial(self, path, rung, first):
+        path = rung_path(path, rung)
+        return path.with_name(f"{path.stem}.{phase(first, round(config['frame_rate']), rung[1])}{path.suffix}")
+
+    def is_already_cached(self, hash_invocation):
+        # a partial rendered without the ladder, or at another phase, has no rungs to reuse
+        if not super().is_already_cached(hash_invocation):
+            return False
+        path = self.partial_movie_directory / f"{hash_invocation}{config['movie_file_extension']}"
+        return all(self.rung_partial(path, rung, self.first_frame()).exists() for rung in self.rungs)
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        self.firsts[self.renderer.num_plays] = self.first_frame()
+        return super().begin_animation(allow_write, file_path)
+
+    def movie_pipe_command(self, file_path, repeat=1):
+        if not self.rungs:
+            return super().movie_pipe_command(file_path, repeat)
+        fps, first = round(config["frame_rate"]), self.firsts[self.renderer.num_plays]
+        filters = self.video_filters(repeat) + [f"split={len(self.rungs) + 1}"]
+        graph = "[0:v]" + ",".join(filters) + "".join(f"[v{i}]" for i in range(len(self.rungs) + 1))
+        for i, (height, rung_fps) in enumerate(self.rungs, start=1):
+            tick = f"floor((n+{first}{{}})*{rung_fps}/{fps})"
+            graph += (
+                f";[v{i}]select='neq({tick.format('')},{tick.format('-1')})',"
+                f"setpts=N/{rung_fps}/TB,scale=-2:{height}[o{i}]"
+            )
+        codec = self.codec_args()
+        command = self.input_args() + ["-filter_complex", graph, "-map", "[v0]", *codec, str(file_path)]
+        for i, rung in enumerate(self.rungs, start=1):
+            command += ["-map", f"[o{i}]", *codec, "-r", str(rung[1]), str(self.rung_partial(file_path, rung, first))]
+        return command
+
+    def combine_to_movie(self):
+        super().combine_to_movie()
+        partials = [(i, path) for i, path in enumerate(self.partial_movie_files) if path is not None]
+        if not partials:
+            return
+        for rung in self.rungs:
+            output = concat(
+                [self.rung_partial(path, rung, self.firsts[i]) for i, path in partials],
+                rung_path(self.movie_file_path, rung),
+            )
+            self.ladder_files.append(output)
@@ -0,0 +1,244 @@
+# draws Surfaces from one array per surface instead of one small numpy call chain per face
+import cairo
+import numpy as np
+from manim.camera.camera import LINE_JOIN_MAP
+from manim.camera.three_d_camera import ThreeDCamera
+from manim.constants import DOWN, OUT, LineJointType
+from manim.mobject.three_d.three_dimensions import Surface
+from manim.utils.family import extract_mobject_family_members
+
+ARRAYS = ("points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas")
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def _unit_normals(points, i):
+    # get_3d_vmob_unit_normal for every face at once, fallbacks included
+    n = points.shape[1]
+    im3 = i - 3 if i > 2 else n - 4
+    ip3 = i + 3 if i < n - 3 else 3
+    v1 = _normalize(points[:, ip3] - points[:, i])
+    v2 = _normalize(points[:, im3] - points[:, i])
+    cp = np.cross(v1, v2)
+    aligned = np.linalg.norm(cp, axis=1) < 1e-6
+    cp[aligned] = np.cross(np.cross(v1[aligned], OUT), v1[aligned])
+    flat = np.linalg.norm(cp, axis=1) < 1e-6
+    cp[flat] = DOWN
+    return _normalize(cp)
+
+
+class Mesh:
+    # One Surface's faces with their points and colours stacked into shared arrays.
+    # Each face's own arrays become views into those, so in-place edits (shift,
+    # set_fill) land here as well, and a face whose array was replaced is caught
+    # by an identity check.
+
+    def __init__(self, surface, faces, buffers):
+        self.surface = surface
+        self.faces = faces
+        self.buffers = buffers
+        for name, buffer in buffers.items():
+            for face, view in zip(faces, buffer):
+                setattr(face, name, view)
+        self.views = {name: [getattr(face, name) for face in faces] for name in buffers}
+        self.lookup = {id(face): (self, i) for i, face in enumerate(faces)}
+        points = buffers["points"]
+        self.shifted = np.empty_like(points)
+        self.projected = np.empty_like(points)
+        n = points.shape[1]
+        self.end = ((n - 1) // 6) * 3
+        # move_to the first anchor, then curve_to each handle pair and anchor
+        self.path_index = [0] + [j for k in range(0, n - 1, 4) for j in (k + 1, k + 2, k + 3)]
+
+    @classmethod
+    def build(cls, surface, faces, camera):
+        if not faces:
+            return None
+        for face in faces:
+            if (
+                len(face.points) < 8
+                or len(face.points) % 4
+                or face.get_background_image() is not None
+                or hasattr(face, "z_index_group")
+                or face in camera.fixed_orientation_mobjects
+                or face in camera.fixed_in_frame_mobjects
+            ):
+                return None
+        try:
+            buffers = {name: np.stack([getattr(f, name) for f in faces]) for name in ARRAYS}
+        except (ValueError, AttributeError):
+            # faces of different sizes or colour gradients
+            return None
+        points = buffers["points"]
+        # one closed run of cubics per face, as set_points_as_corners makes them
+        if not np.isfinite(points).all() or not np.array_equal(points[:, 3:-1:4], points[:, 4::4]):
+            return None
+        return cls(surface, faces, buffers)
+
+    def valid(self, surface, faces):
+        return (
+            surface is self.surface
+            and len(faces) == len(self.faces)
+            and all(a is b for a, b in zip(faces, self.faces))
+            and all(
+                getattr(face, name) is view
+                for name, views in self.views.items()
+                for face, view in zip(faces, views)
+            )
+        )
+
+    def update(self, camera):
+        points = self.buffers["points"]
+        rotation = camera.get_rotation_matrix()
+        # ThreeDCamera.project_points over every point of the surface
+        np.subtract(points, camera.frame_center, out=self.shifted)
+        np.matmul(self.shifted, rotation.T, out=self.projected)
+        zs = self.projected[..., 2]
+        distance = camera.get_focal_distance()
+        if camera.exponential_projection:
+            factor = np.exp(zs / distance)
+            behind = zs < 0
+            factor[behind] = distance / (distance - zs[behind])
+        else:
+            with np.errstate(divide="ignore"):
+                factor = distance / (distance - zs)
+            factor[(distance - zs) < 0] = 10**6
+        self.projected[..., :2] *= (factor * camera.get_zoom())[..., None]
+
+        # ThreeDCamera sorts by the bounding box centre of each face
+        centers = (points.min(axis=1) + points.max(axis=1)) / 2
+        self.depths = (centers @ rotation[2]).tolist()
+        self.shade = [face.shade_in_3d for face in self.faces]
+
+        flat = self.projected[..., :2]
+        self.paths = flat[:, self.path_index].reshape(len(points), -1).tolist()
+        first, last = flat[:, 0], flat[:, -1]
+        tolerance = self.faces[0].tolerance_for_point_equality
+        self.closed = np.all(np.abs(first - last) <= tolerance + 1e-5 * np.abs(last), axis=1).tolist()
+        self.gradients = np.concatenate([flat[:, 0], flat[:, self.end]], axis=1).tolist()
+        self.colors = {name: self.shaded(camera, self.buffers[name]) for name in ARRAYS[1:]}
+
+    def shaded(self, camera, rgbas):
+        # ThreeDCamera.modified_rgbas: the light source is fixed in the scene, so
+        # only the camera moving leaves these unchanged, but they are cheap here
+        if not camera.should_apply_shading:
+            return rgbas.tolist()
+        points = self.buffers["points"]
+        light = camera.light_source.points[0]
+        if rgbas.shape[1] < 2:
+            result = np.repeat(rgbas[:, :1], 2, axis=1)
+        else:
+            result = rgbas[:, :2].copy()
+        for row, index in ((0, 0), (1, self.end)):
+            to_sun = _normalize(light - points[:, index])
+            factor = 0.5 * np.einsum("ij,ij->i", _unit_normals(points, index), to_sun) ** 3
+            factor[factor < 0] *= 0.5
+            result[:, row, :3] += factor[:, None]
+        shaded, plain = result.tolist(), rgbas.tolist()
+        return [s if shade else p for s, p, shade in zip(shaded, plain, self.shade)]
+
+
+class BatchedThreeDCamera(ThreeDCamera):
+    # When only the camera moves, a Surface's faces don't change, yet ThreeDCamera
+    # projects, sorts and shades each of them with its own small numpy calls.
+    # Here every Surface is projected, depth sorted and shaded as one array per
+    # frame, and only the cairo calls remain per face.
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.meshes = {}
+        self.lookup = {}
+
+    def capture_mobjects(self, mobjects, **kwargs):
+        self.reset_rotation_matrix()
+        self.prepare(mobjects)
+        super().capture_mobjects(mobjects, **kwargs)
+
+    def prepare(self, mobjects):
+        meshes = {}
+        for surface in extract_mobject_family_members(mobjects):
+            if not isinstance(surface, Surface):
+                continue
+            faces = list(surface.submobjects)
+            mesh = self.meshes.get(id(surface))
+            if mesh is None or not mesh.valid(surface, faces):
+                mesh = Mesh.build(surface, faces, self)
+            if mesh is not None:
+                mesh.update(self)
+                meshes[id(surface)] = mesh
+        # surfaces no longer on screen are dropped, memory stays flat
+        self.meshes = meshes
+        self.lookup = {}
+        for mesh in meshes.values():
+            self.lookup.update(mesh.lookup)
+
+    def get_mobjects_to_display(self, *args, **kwargs):
+        mobjects = super(ThreeDCamera, self).get_mobjects_to_display(*args, **kwargs)
+        rotation = self.get_rotation_matrix()
+        lookup = self.lookup
+
+        def z_key(mob):
+            entry = lookup.get(id(mob))
+            if entry is not None:
+                mesh, i = entry
+                return mesh.depths[i] if mesh.shade[i] else np.inf
+            if not (hasattr(mob, "shade_in_3d") and mob.shade_in_3d):
+                return np.inf
+            return np.dot(mob.get_z_index_reference_point(), rotation.T)[2]
+
+        return sorted(mobjects, key=z_key)
+
+    def display_vectorized(self, vmobject, ctx):
+        entry = self.lookup.get(id(vmobject))
+        if entry is None:
+            return super().display_vectorized(vmobject, ctx)
+        mesh, i = entry
+        path = mesh.paths[i]
+        ctx.new_path()
+        ctx.new_sub_path()
+        ctx.move_to(path[0], path[1])
+        for j in range(2, len(path), 6):
+            ctx.curve_to(*path[j:j + 6])
+        if mesh.closed[i]:
+            ctx.close_path()
+        self.batched_stroke(ctx, vmobject, mesh, i, background=True)
+        self.set_batched_color(ctx, vmobject, mesh, i, mesh.colors["fill_rgbas"][i])
+        ctx.fill_preserve()
+        self.batched_stroke(ctx, vmobject, mesh, i)
+        return self
+
+    def batched_stroke(self, ctx, vmobject, mesh, i, background=False):
+        width = vmobject.get_stroke_width(background)
+        if width == 0:
+            return
+        name = "background_stroke_rgbas" if background else "stroke_rgbas"
+        self.set_batched_color(ctx, vmobject, mesh, i, mesh.colors[name][i])
+        ctx.set_line_width(width * self.cairo_line_width_multiple)
+        if vmobject.joint_type != LineJointType.AUTO:
+            ctx.set_line_join(LINE_JOIN_MAP[vmobject.joint_type])
+        ctx.stroke_preserve()
+
+    def set_batched_color(self, ctx, vmobject, mesh, i, rgbas):
+        # cairo surfaces store colours as BGR
+        if len(rgbas) == 1:
+            r, g, b, a = rgbas[0]
+            ctx.set_source_rgba(b, g, r, a)
+            return
+        if not mesh.shade[i]:
+            self.set_cairo_context_color(ctx, np.array(rgbas), vmobject)
+            return
+        gradient = cairo.LinearGradient(*mesh.gradients[i])
+        step = 1.0 / (len(rgbas) - 1)
+        for (r, g, b, a), offset in zip(rgbas, np.arange(0, 1 + step, step)):
+            gradient.add_color_stop_rgba(offset, b, g, r, a)
+        ctx.set_source(gradient)
+
+
+def install(scene):
+    renderer = scene.renderer
+    if type(renderer.camera) is ThreeDCamera:
+        renderer.camera = BatchedThreeDCamera()
+    return renderer.camera
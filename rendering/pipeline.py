@@ -0,0 +1,44 @@
+# feeds ffmpeg from a second thread, so rasterizing the next frames overlaps encoding this one
+import queue
+import threading
+
+from rendering.holds import HoldFileWriter
+
+
+class PipelinedFileWriter(HoldFileWriter):
+    # frames waiting for the encoder; when it falls this far behind, rendering blocks
+    depth = 8
+
+    def open_movie_pipe(self, file_path=None, repeat=1):
+        super().open_movie_pipe(file_path, repeat)
+        self.frames = queue.Queue(self.depth)
+        self.encode_error = None
+        self.encoder = threading.Thread(
+            target=self.encode, args=(self.writing_process.stdin, self.frames), daemon=True
+        )
+        self.encoder.start()
+
+    def encode(self, stdin, frames):
+        while True:
+            frame = frames.get()
+            if frame is None:
+                return
+            if self.encode_error:
+                # keep draining so the renderer never waits on a dead ffmpeg
+                continue
+            try:
+                # the pipe write releases the GIL while ffmpeg takes the frame
+                stdin.write(frame.data)
+            except OSError as e:
+                self.encode_error = e
+
+    def write_raw_frame(self, frame):
+        # by reference: get_frame() hands out a fresh array every frame and holds repeat one
+        self.frames.put(frame)
+
+    def close_movie_pipe(self):
+        self.frames.put(None)
+        self.encoder.join()
+        super().close_movie_pipe()
+        if self.encode_error:
+            raise self.encode_error
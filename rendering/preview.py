@@ -0,0 +1,224 @@
+# live preview: re-runs the scene classes whose code changed at low resolution and
+# streams their frames as MJPEG, dropping frames whenever rendering falls behind real time
+import argparse
+import hashlib
+import importlib
+import inspect
+import io
+import os
+import sys
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from manim import tempconfig
+from PIL import Image
+
+from rendering import geometry, transform
+from rendering.cache import dependencies
+from rendering.render import scene_settings
+from rendering.scenes import MODULES, scene_classes
+from rendering.tex import collect, precompile
+
+
+class SourceChanged(Exception):
+    pass
+
+
+class Watcher:
+    def __init__(self, modules=MODULES):
+        self.modules = modules
+        self.mtimes = self.read()
+
+    def read(self):
+        return {
+            name: os.stat(importlib.import_module(name).__file__).st_mtime_ns
+            for name in self.modules
+        }
+
+    def changed(self):
+        return self.read() != self.mtimes
+
+    def check(self):
+        if self.changed():
+            raise SourceChanged()
+
+    def reload(self):
+        self.mtimes = self.read()
+        for name in self.modules:
+            importlib.reload(sys.modules[name])
+
+
+def class_hashes(modules=MODULES):
+    hashes = {}
+    for name in modules:
+        for cls in scene_classes(name):
+            digest = hashlib.sha256()
+            for obj in dependencies(cls):
+                digest.update(inspect.getsource(obj).encode())
+            hashes[cls.__name__] = (name, digest.hexdigest())
+    return hashes
+
+
+class FrameHub:
+    # the latest frame of every scene, as jpeg, for any number of viewers
+    def __init__(self, quality=80):
+        self.quality = quality
+        self.frames = {}
+        self.condition = threading.Condition()
+
+    def publish(self, scene, frame):
+        buffer = io.BytesIO()
+        Image.fromarray(frame[..., :3]).save(buffer, "JPEG", quality=self.quality)
+        with self.condition:
+            count = self.frames.get(scene, (0, None))[0]
+            self.frames[scene] = (count + 1, buffer.getvalue())
+            self.condition.notify_all()
+
+    def next(self, scene, seen, timeout=5):
+        with self.condition:
+            self.condition.wait_for(lambda: self.frames.get(scene, (0, None))[0] > seen, timeout)
+            return self.frames.get(scene, (0, None))
+
+
+class MJPEGHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        hub = self.server.hub
+        scene = self.path.strip("/")
+        if not scene:
+            links = "".join(f'<p><a href="/{s}">{s}</a></p>' for s in sorted(hub.frames))
+            page = f"<html><body style='background:#222;color:#ddd'>{links}</body></html>".encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=frame")
+        self.end_headers()
+        seen = 0
+        try:
+            while True:
+                seen, jpeg = hub.next(scene, seen)
+                if jpeg is None:
+                    continue
+                self.wfile.write(
+                    b"--frame\r\nContent-Type: image/jpeg\r\n"
+                    + f"Content-Length: {len(jpeg)}\r\n\r\n".encode()
+                    + jpeg + b"\r\n"
+                )
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def install(scene, hub, watcher, speed=1.0):
+    renderer = scene.renderer
+    name = type(scene).__name__
+    render, add_frame = renderer.render, renderer.add_frame
+    start = time.perf_counter()
+
+    def lag(scene_time):
+        return time.perf_counter() - start - scene_time / speed
+
+    def preview_render(scene, t, moving_mobjects):
+        watcher.check()
+        dt = 1 / renderer.camera.frame_rate
+        if lag(renderer.time) > dt:
+            # behind real time: skip rasterizing this frame, keep the clock going
+            renderer.time += dt
+            return
+        render(scene, t, moving_mobjects)
+
+    def preview_add_frame(frame, num_frames=1):
+        delay = -lag(renderer.time)
+        if delay > 0:
+            time.sleep(delay)
+        hub.publish(name, frame)
+        add_frame(frame, num_frames)
+
+    renderer.render = preview_render
+    renderer.add_frame = preview_add_frame
+
+
+def run(module, scene_name, hub, watcher, settings, speed=1.0):
+    cls = getattr(sys.modules[module], scene_name)
+    transform.install(geometry.install())
+    with tempconfig({**scene_settings(module, "l"), **settings}):
+        precompile(collect(cls))
+        scene = cls()
+        install(scene, hub, watcher, speed)
+        scene.render()
+        if not scene.renderer.num_plays:
+            # still images never go through add_frame
+            hub.publish(scene_name, scene.renderer.get_frame())
+
+
+def preview(names, hub, settings, speed=1.0, poll=0.2):
+    watcher = Watcher()
+    hashes = class_hashes()
+    unknown = [n for n in names if n not in hashes]
+    if unknown:
+        raise SystemExit(f"unknown scenes: {', '.join(unknown)}")
+    pending = list(names)
+    while True:
+        if watcher.changed():
+            try:
+                watcher.reload()
+                new = class_hashes()
+            except Exception:
+                traceback.print_exc()
+                continue
+            changed = [n for n, h in new.items() if hashes.get(n) != h and (not names or n in names)]
+            hashes = new
+            pending = changed + [n for n in pending if n not in changed]
+            if changed:
+                print(f"changed: {', '.join(changed)}", flush=True)
+        if not pending:
+            time.sleep(poll)
+            continue
+        scene = pending.pop(0)
+        try:
+            run(hashes[scene][0], scene, hub, watcher, settings, speed)
+        except SourceChanged:
+            # the interrupted scene starts over with the new code
+            pending.insert(0, scene)
+        except Exception:
+            traceback.print_exc()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live low resolution preview of the scenes being edited.")
+    parser.add_argument("scenes", nargs="*", help="preview these now and on every change (default: whatever changes)")
+    parser.add_argument("--height", type=int, default=270, help="pixel height")
+    parser.add_argument("--fps", type=int, default=15)
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed relative to real time")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    settings = {
+        "pixel_height": args.height,
+        "pixel_width": args.height * 16 // 9,
+        "frame_rate": args.fps,
+        "write_to_movie": False,
+        "save_last_frame": False,
+        "disable_caching": True,
+    }
+    hub = FrameHub()
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), MJPEGHandler)
+    server.daemon_threads = True
+    server.hub = hub
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"preview at http://127.0.0.1:{args.port}/", flush=True)
+    try:
+        preview(args.scenes, hub, settings, args.speed)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+# renders a scene with every play() timed: LaTeX, updaters, rasterizing and encoding,
+# written as a report and a Chrome trace (chrome://tracing, ui.perfetto.dev, speedscope)
+import argparse
+import copy
+import json
+import os
+import resource
+import time
+from contextlib import contextmanager
+
+from manim.mobject.text import tex_mobject
+
+from rendering import STATE_DIR, render
+from rendering.reactive import VectorBinding
+from rendering.render import QUALITIES, render_scene
+from rendering.scenes import discover
+
+PROFILE_DIR = STATE_DIR / "profile"
+
+
+def peak_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def label(updater):
+    # Binding/VectorBinding keep the user's function in .apply or .update
+    target = getattr(updater, "apply", None) or getattr(updater, "update", None) or updater
+    code = getattr(target, "__code__", None)
+    if code is None:
+        return repr(updater)
+    name = getattr(target, "__qualname__", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class TimedUpdater:
+    def __init__(self, updater, profiler, name):
+        self.updater = updater
+        # get_parameters follows __wrapped__, so dt updaters still get dt
+        self.__wrapped__ = updater
+        self.profiler = profiler
+        self.name = name
+
+    def __call__(self, *args):
+        start = time.perf_counter()
+        try:
+            return self.updater(*args)
+        finally:
+            self.profiler.record_updater(self.name, start)
+
+    # remove_updater(original) still finds the wrapped one
+    def __eq__(self, other):
+        return other is self or self.updater == other
+
+    def __hash__(self):
+        return hash(self.updater)
+
+    def __deepcopy__(self, memo):
+        return TimedUpdater(copy.deepcopy(self.updater, memo), self.profiler, self.name)
+
+
+class TimedPipe:
+    # ffmpeg's stdin as the encoder thread of PipelinedFileWriter sees it; its writes
+    # are where encoding time goes once write_frame only queues the frame
+    def __init__(self, stdin, profiler):
+        self.stdin = stdin
+        self.profiler = profiler
+
+    def write(self, data):
+        start = time.perf_counter()
+        try:
+            return self.stdin.write(data)
+        finally:
+            self.profiler.record("pipe frame", "encoder", start, "encoder", tid=2)
+
+
+class Profiler:
+    def __init__(self, time_updaters=True):
+        self.time_updaters = time_updaters
+        self.start = time.perf_counter()
+        self.events = []
+        self.plays = []
+        self.updaters = {}
+        self.bucket = self.new_bucket()
+        self.wrap_pending = False
+
+    def new_bucket(self):
+        # one per play(): the construct() code leading up to it and the play itself
+        return {
+            "since": time.perf_counter(), "wall": 0, "frames": 0, "written": 0,
+            "raster": 0, "encode": 0, "encoder": 0, "updaters": 0, "tex": 0,
+        }
+
+    def record(self, name, category, start, key=None, tid=1):
+        end = time.perf_counter()
+        self.events.append({
+            "name": name, "cat": category, "ph": "X", "pid": 1, "tid": tid,
+            "ts": (start - self.start) * 1e6, "dur": (end - start) * 1e6,
+        })
+        if key:
+            self.bucket[key] += end - start
+
+    def record_updater(self, name, start):
+        self.record(name, "updater", start, "updaters")
+        stats = self.updaters.setdefault(name, {"calls": 0, "seconds": 0})
+        stats["calls"] += 1
+        stats["seconds"] += self.events[-1]["dur"] / 1e6
+
+    def timed(self, function, name, key, count=None):
+        def timed_call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(name, key, start, key)
+                if count:
+                    self.bucket[count] += 1
+        return timed_call
+
+    def close_bucket(self, animations, duration):
+        self.bucket.update(
+            index=len(self.plays), animations=animations, duration=duration, peak_mb=peak_mb(),
+        )
+        self.plays.append(self.bucket)
+        self.bucket = self.new_bucket()
+
+    def wrap_updaters(self, scene):
+        for mobject in scene.get_mobject_family_members():
+            # Trajectory finds follow() bindings by type and evaluates them in one batch
+            # instead of calling them; wrapped, they would run per frame like a plain updater
+            mobject.updaters = [
+                u if isinstance(u, (TimedUpdater, VectorBinding)) else TimedUpdater(u, self, label(u))
+                for u in mobject.updaters
+            ]
+
+    @contextmanager
+    def tex(self):
+        # the batch compile in render_scene and whatever manim still compiles itself
+        precompile, tex_to_svg_file = render.precompile, tex_mobject.tex_to_svg_file
+        render.precompile = self.timed(precompile, "precompile tex", "tex")
+        tex_mobject.tex_to_svg_file = self.timed(tex_to_svg_file, "tex to svg", "tex")
+        try:
+            yield
+        finally:
+            render.precompile, tex_mobject.tex_to_svg_file = precompile, tex_to_svg_file
+
+    def install(self, scene):
+        renderer = scene.renderer
+        writer = renderer.file_writer
+        play = renderer.play
+
+        def profiled_play(scene, *args, **kwargs):
+            start = time.perf_counter()
+            self.bucket["construct"] = start - self.bucket.pop("since")
+            self.wrap_pending = True
+            try:
+                play(scene, *args, **kwargs)
+            finally:
+                animations = [type(animation).__name__ for animation in scene.animations or []]
+                self.record(f"play {len(self.plays)}: {'+'.join(animations)}", "play", start, "wall")
+                self.close_bucket(animations, scene.duration)
+
+        update_mobjects = scene.update_mobjects
+
+        def profiled_update_mobjects(dt):
+            # once per play, after the animations added their mobjects to the scene
+            if self.wrap_pending and self.time_updaters:
+                self.wrap_updaters(scene)
+                self.wrap_pending = False
+            update_mobjects(dt)
+
+        scene_finished = renderer.scene_finished
+
+        def profiled_scene_finished(scene):
+            # what came after the last play, or the whole of a scene without one: its
+            # tex and the still image saved here still count
+            start = time.perf_counter()
+            self.bucket["construct"] = start - self.bucket.pop("since")
+            try:
+                scene_finished(scene)
+            finally:
+                self.record("scene finished", "finish", start, "wall")
+                self.close_bucket([], 0)
+
+        renderer.play = profiled_play
+        renderer.scene_finished = profiled_scene_finished
+        renderer.update_frame = self.timed(renderer.update_frame, "rasterize", "raster", "frames")
+        writer.write_frame = self.timed(writer.write_frame, "write frame", "encode", "written")
+        writer.end_animation = self.timed(writer.end_animation, "close ffmpeg", "encode")
+        if hasattr(writer, "encode"):
+            # pipelined: write_frame above is only the queue put, time the encoder thread too
+            encode = writer.encode
+            writer.encode = lambda stdin, frames: encode(TimedPipe(stdin, self), frames)
+        scene.update_mobjects = profiled_update_mobjects
+
+    def report(self, result):
+        return {
+            **result,
+            "peak_mb": peak_mb(),
+            "plays": self.plays,
+            "updaters": dict(sorted(self.updaters.items(), key=lambda i: -i[1]["seconds"])),
+        }
+
+
+def profile_scene(module, scene, quality="l"):
+    profiler = Profiler()
+    with profiler.tex():
+        result = render_scene(module, scene, quality, prepare=profiler.install)
+    report = profiler.report(result)
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    (PROFILE_DIR / f"{scene}.json").write_text(json.dumps(report, indent=2))
+    trace = PROFILE_DIR / f"{scene}.trace.json"
+    trace.write_text(json.dumps({"traceEvents": profiler.events, "displayTimeUnit": "ms"}))
+    return report, trace
+
+
+def print_report(report, top=10):
+    print(f"{report['scene']}: {report['seconds']:.2f}s, peak {report['peak_mb']:.0f} MB")
+    columns = ("construct", "wall", "frames", "raster", "encode", "encoder", "updaters", "tex")
+    print(f"  {'play':>4}  " + "".join(f"{c:>10}" for c in columns) + "  animations")
+    for play in report["plays"]:
+        cells = "".join(
+            f"{play[c]:>10}" if c == "frames" else f"{play[c]:>10.3f}" for c in columns
+        )
+        print(f"  {play['index']:>4}  {cells}  {'+'.join(play['animations'])}")
+    for name, stats in list(report["updaters"].items())[:top]:
+        print(f"  {stats['seconds']:8.3f}s {stats['calls']:7} calls  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile where the render time of scenes goes.")
+    parser.add_argument("scenes", nargs="+")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument("--top", type=int, default=10, help="updaters to list")
+    args = parser.parse_args()
+
+    modules = {name: module for module, name in discover()}
+    for scene in args.scenes:
+        if scene not in modules:
+            parser.error(f"unknown scene {scene}")
+    for scene in args.scenes:
+        report, trace = profile_scene(modules[scene], scene, args.quality)
+        print_report(report, args.top)
+        print(f"  trace: {trace}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# updaters that declare the ValueTrackers (and mobjects) they read and only run when
+# one of them moved
+import hashlib
+
+import numpy as np
+from manim.mobject.value_tracker import ValueTracker
+
+
+def current(dependency):
+    # a ValueTracker by its value, any other mobject by what its family's points look like
+    if isinstance(dependency, ValueTracker):
+        return dependency.get_value()
+    digest = hashlib.blake2b(digest_size=16)
+    for mob in dependency.get_family():
+        digest.update(np.ascontiguousarray(mob.points).tobytes())
+    return digest.digest()
+
+
+class Binding:
+    # Mobjects among the dependencies cover bindings that place one mobject against
+    # another (next_to a bound line, c2p on the axes): they re-run when it moves for
+    # whatever reason. A source updated later in the same frame is caught on the next
+    # one, as always_redraw would be.
+    def __init__(self, mobject, trackers, update):
+        self.mobject = mobject
+        self.trackers = list(trackers)
+        self.update = update
+        self.values = None
+
+    def __call__(self, mobject):
+        values = tuple(current(dependency) for dependency in self.trackers)
+        if values == self.values:
+            return
+        self.values = values
+        # like always_redraw, copies of the mobject keep updating the original
+        self.update(self.mobject)
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def bind(mobject, trackers, update):
+    mobject.add_updater(Binding(mobject, trackers, update), call_updater=True)
+    return mobject
+
+
+class VectorBinding(Binding):
+    # geometry takes one array per tracker and returns one row per sample, so a
+    # Trajectory can evaluate it for every frame of a play() call at once
+    def __init__(self, mobject, trackers, geometry, apply):
+        super().__init__(mobject, trackers, self.apply_current)
+        self.geometry = geometry
+        self.apply = apply
+
+    def apply_current(self, mobject):
+        rows = self.geometry(*(np.array([value], dtype=float) for value in self.values))
+        self.apply(mobject, rows[0])
+
+
+def follow(mobject, trackers, geometry, apply):
+    mobject.add_updater(VectorBinding(mobject, trackers, geometry, apply), call_updater=True)
+    return mobject
+
+
+def redraw(build, trackers):
+    # always_redraw for geometry that can't be edited in place, e.g. DashedLine or Angle
+    return bind(build(), trackers, lambda m: m.become(build()))
+
+
+def set_line(line, start, end):
+    line.start = np.array(start, dtype=float)
+    line.end = np.array(end, dtype=float)
+    line.set_points_by_ends(line.start, line.end, line.buff, line.path_arc)
+    return line
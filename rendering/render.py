@@ -0,0 +1,63 @@
+import importlib
+import time
+from functools import partial
+
+from manim import tempconfig
+
+from rendering import dirty, geometry, holds, meshes, transform
+from rendering.ladder import LadderFileWriter
+from rendering.pipeline import PipelinedFileWriter
+from rendering.scenes import scene_class
+from rendering.tex import TEX_DIR, collect, precompile
+
+QUALITIES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+
+def scene_settings(module_name, quality="h", options=None):
+    module = importlib.import_module(module_name)
+    return {
+        "quality": QUALITIES[quality],
+        "input_file": module.__file__,
+        "progress_bar": "none",
+        # one tex cache shared by every worker
+        "tex_dir": str(TEX_DIR),
+        **(options or {}),
+    }
+
+
+def render_scene(module_name, scene_name, quality="h", options=None, prepare=None, ladder=None, params=None):
+    settings = scene_settings(module_name, quality, options)
+    cls = scene_class(module_name, scene_name)
+    start = time.perf_counter()
+    transform.install(geometry.install())
+    with tempconfig(settings):
+        precompile(collect(cls))
+        scene = cls(**(params or {}))
+        if ladder:
+            holds.install(scene, partial(LadderFileWriter, rungs=ladder))
+        else:
+            holds.install(scene, PipelinedFileWriter)
+        dirty.install(scene)
+        meshes.install(scene)
+        if prepare:
+            prepare(scene)
+        scene.render()
+    writer = scene.renderer.file_writer
+    # scenes without a single play() are saved as a still image; with write_to_movie
+    # off the writer never gets a movie path and there is no output
+    output = getattr(writer, "movie_file_path" if scene.renderer.num_plays else "image_file_path", None)
+    result = {
+        "module": module_name,
+        "scene": scene_name,
+        "output": str(output) if output else None,
+        "seconds": time.perf_counter() - start,
+    }
+    if ladder:
+        result["ladder"] = [str(path) for path in writer.ladder_files]
+    return result
@@ -0,0 +1,118 @@
+# renders every scene of the episode on a process pool, longest scenes first
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from rendering import STATE_DIR
+from rendering.cache import DEFAULT_MAX_MB, RenderCache, scene_key
+from rendering.ladder import RUNGS, parse_rung
+from rendering.render import QUALITIES, render_scene
+from rendering.scenes import discover, scene_class
+
+TIMINGS_FILE = STATE_DIR / "timings.json"
+REPORT_FILE = STATE_DIR / "report.json"
+
+
+def load_timings():
+    if not TIMINGS_FILE.exists():
+        return {}
+    return json.loads(TIMINGS_FILE.read_text())
+
+
+def schedule(scenes, timings):
+    # scenes we have never timed go first, they could be the slow ones
+    return sorted(
+        scenes,
+        key=lambda s: timings.get(f"{s[0]}.{s[1]}", float("inf")),
+        reverse=True,
+    )
+
+
+def render_all(scenes, quality="h", jobs=None, cache=None, ladder=None):
+    timings = load_timings()
+    results = {}
+    keys = {}
+    start = time.perf_counter()
+    for module, name in scenes:
+        keys[module, name] = scene_key(scene_class(module, name), {"quality": quality})
+        cached = cache.get(keys[module, name], name) if cache else None
+        if cached:
+            results[module, name] = {
+                "module": module, "scene": name, "output": str(cached), "seconds": 0, "cached": True,
+            }
+            print(f"{name}: {cached} (cached)")
+    pending = [s for s in scenes if s not in results]
+
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(render_scene, module, name, quality, ladder=ladder): (module, name)
+            for module, name in schedule(pending, timings)
+        }
+        for future in as_completed(futures):
+            module, name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"module": module, "scene": name, "error": repr(e)}
+            else:
+                timings[f"{module}.{name}"] = result["seconds"]
+                if cache:
+                    result["output"] = str(cache.put(keys[module, name], name, result["output"]))
+            results[module, name] = result
+            print(f"{name}: {result.get('output', result.get('error'))}")
+    wall = time.perf_counter() - start
+
+    STATE_DIR.mkdir(exist_ok=True)
+    TIMINGS_FILE.write_text(json.dumps(timings, indent=2))
+    report = {
+        "quality": quality,
+        "wall_seconds": wall,
+        "serial_seconds": sum(r.get("seconds", 0) for r in results.values()),
+        "scenes": [results[s] for s in scenes],
+    }
+    REPORT_FILE.write_text(json.dumps(report, indent=2))
+    return report
+
+
+def rung_list(value):
+    # "720p30,480p15", or "default" for RUNGS
+    rungs = list(RUNGS) if value == "default" else [r for r in value.split(",") if r]
+    for rung in rungs:
+        try:
+            parse_rung(rung)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"{rung!r} is not HEIGHTpFPS")
+    return rungs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render every scene in parallel.")
+    parser.add_argument("scenes", nargs="*", help="only render these scene classes")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="h")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--no-cache", action="store_true", help="re-render scenes even if unchanged")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_MB, help="cache size limit in MB")
+    parser.add_argument(
+        "--ladder", type=rung_list, action="append", metavar="RUNG[,RUNG]",
+        help=f"also encode these HEIGHTpFPS versions in the same pass, 'default' for {','.join(RUNGS)}",
+    )
+    args = parser.parse_args()
+
+    scenes = [s for s in discover() if not args.scenes or s[1] in args.scenes]
+    ladder = None if args.ladder is None else [rung for rungs in args.ladder for rung in rungs]
+    # the cache keeps one output per scene, the rungs would be missing on a hit
+    cache = None if args.no_cache or ladder else RenderCache(max_mb=args.cache_size)
+    report = render_all(scenes, args.quality, args.jobs, cache, ladder)
+    failed = [s for s in report["scenes"] if "error" in s]
+    print(
+        f"{len(scenes) - len(failed)}/{len(scenes)} scenes in {report['wall_seconds']:.1f}s "
+        f"({report['serial_seconds']:.1f}s of render time), report in {REPORT_FILE}"
+    )
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
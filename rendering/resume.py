@@ -0,0 +1,127 @@
+# re-renders plays N..M of a scene and splices them into its last full render
+import argparse
+import json
+import os
+import shutil
+import time
+
+from rendering import STATE_DIR
+from rendering.chunks import checkpoint
+from rendering.ffmpeg import concat
+from rendering.render import QUALITIES, render_scene
+from rendering.scenes import discover
+from rendering.timeline import probe
+
+RESUME_DIR = STATE_DIR / "resume"
+
+
+def first_change(old, new, start=0):
+    # the first play whose length, animations, or state before or after differ from the
+    # last render
+    for index in range(start, max(len(old), len(new))):
+        if index >= len(old) or index >= len(new):
+            return index
+        if any(old[index][k] != new[index][k] for k in ("end", "duration", "animations") if k in old[index]):
+            return index
+        if old[index]["state"] != new[index]["state"]:
+            # the previous play ended the same, so only code between the two changed;
+            # a manifest from before "end" was recorded can't tell that from an edit
+            # to the previous play itself
+            return index if "end" in old[index] else max(index - 1, 0)
+    return None
+
+
+class Resumable:
+    def __init__(self, module, scene, quality="h"):
+        self.module = module
+        self.scene = scene
+        self.quality = quality
+        self.root = RESUME_DIR / f"{scene}-{quality}"
+        self.manifest_file = self.root / "manifest.json"
+        self.manifest = json.loads(self.manifest_file.read_text()) if self.manifest_file.exists() else None
+
+    def segment(self, index):
+        return self.root / "segments" / f"{index:04}.mp4"
+
+    def render(self, first=0, last=None, plays=None):
+        captured = []
+        verify = checkpoint(first, plays[first]["state"]) if plays and first else None
+
+        def prepare(scene):
+            captured.append(scene)
+            if verify:
+                verify(scene)
+
+        options = {
+            "from_animation_number": first,
+            "upto_animation_number": last or 0,
+            # kept between runs so manim's partial movie cache can skip unchanged plays
+            "media_dir": str((self.root / "media").resolve()),
+        }
+        render_scene(self.module, self.scene, self.quality, options, prepare=prepare)
+        return captured[0].renderer.file_writer.partial_movie_files
+
+    def store(self, partials, indices, plays):
+        (self.root / "segments").mkdir(parents=True, exist_ok=True)
+        for index in indices:
+            temporary = self.segment(index).with_suffix(".tmp")
+            shutil.copyfile(partials[index], temporary)
+            os.replace(temporary, self.segment(index))
+        for stale in self.root.glob("segments/*.mp4"):
+            if int(stale.stem) >= len(plays):
+                stale.unlink()
+        output = concat([self.segment(i) for i in range(len(plays))], self.root / f"{self.scene}.mp4")
+        self.manifest = {"plays": plays, "output": str(output)}
+        self.manifest_file.write_text(json.dumps(self.manifest, indent=2))
+        return output
+
+    def resume(self, first, last=None):
+        plays = probe(self.module, self.scene, self.quality)
+        if not plays:
+            raise ValueError(f"{self.scene} has no play() calls to resume from")
+        if self.manifest is None:
+            first, last = 0, None
+        else:
+            old = self.manifest["plays"]
+            changed = first_change(old, plays)
+            if changed is None and first >= len(plays):
+                return {"output": self.manifest["output"], "first": first, "last": last}
+            # the cached video only covers what hasn't changed before N ...
+            if changed is not None:
+                first = min(first, changed)
+            # ... and after M
+            if last is not None and first_change(old, plays, start=last + 1) is not None:
+                last = None
+        if last is not None:
+            # upto_animation_number=0 means "no limit"
+            last = max(last, first, 1) if len(plays) > 1 else None
+            last = None if last >= len(plays) - 1 else last
+        partials = self.render(first, last, plays)
+        end = len(plays) - 1 if last is None else last
+        output = self.store(partials, range(first, end + 1), plays)
+        return {"output": str(output), "first": first, "last": end}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Re-render plays N..M of a scene and splice them into its last full render."
+    )
+    parser.add_argument("scene")
+    parser.add_argument("--from", dest="first", type=int, default=0, help="first play to re-render")
+    parser.add_argument("--to", dest="last", type=int, help="last play to re-render (default: the end)")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="h")
+    args = parser.parse_args()
+
+    modules = {name: module for module, name in discover()}
+    if args.scene not in modules:
+        parser.error(f"unknown scene {args.scene}")
+    start = time.perf_counter()
+    result = Resumable(modules[args.scene], args.scene, args.quality).resume(args.first, args.last)
+    print(
+        f"{args.scene}: re-rendered plays {result['first']}..{result['last']} "
+        f"in {time.perf_counter() - start:.1f}s, {result['output']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import importlib
+import inspect
+
+from manim import Scene
+
+MODULES = ("video", "example1")
+
+
+def scene_classes(module_name):
+    module = importlib.import_module(module_name)
+    classes = [
+        cls for _, cls in inspect.getmembers(module, inspect.isclass)
+        if issubclass(cls, Scene) and cls.__module__ == module.__name__
+    ]
+    # keep the order the scenes are written in
+    return sorted(classes, key=lambda cls: inspect.getsourcelines(cls)[1])
+
+
+def discover(modules=MODULES):
+    return [(name, cls.__name__) for name in modules for cls in scene_classes(name)]
+
+
+def scene_class(module_name, scene_name):
+    return getattr(importlib.import_module(module_name), scene_name)
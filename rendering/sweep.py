@@ -0,0 +1,101 @@
+# renders one parameterized scene class for many values of a constructor argument on a
+# process pool; every worker builds the background planes and loads tex only once
+import argparse
+import inspect
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from manim import config, tempconfig
+from manim.scene import vector_space_scene
+
+from rendering import geometry
+from rendering.render import QUALITIES, render_scene, scene_settings
+from rendering.scenes import discover, scene_class
+from rendering.tex import collect, precompile
+
+
+def memoized(cls):
+    # LinearTransformationScene.setup builds the same NumberPlane for every job; a copy
+    # of the first one is much cheaper than laying out all of its lines again
+    built = {}
+
+    def build(*args, **kwargs):
+        key = repr((args, sorted(kwargs.items()), config.frame_width, config.frame_height))
+        if key not in built:
+            built[key] = cls(*args, **kwargs)
+        return built[key].copy()
+
+    return build
+
+
+def warm_worker():
+    vector_space_scene.NumberPlane = memoized(vector_space_scene.NumberPlane)
+    geometry.install()
+
+
+def default_param(cls):
+    names = [
+        name for name, p in inspect.signature(cls.__init__).parameters.items()
+        if name != "self" and p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY)
+    ]
+    return names[0] if names else None
+
+
+def output_name(scene, param, label):
+    return f"{scene}_{param}_{label}"
+
+
+def sweep(module, scene, param, values, quality="h", jobs=None, degrees=False):
+    cls = scene_class(module, scene)
+    # the tex is the same for every value, compile it before the workers race for it
+    with tempconfig(scene_settings(module, quality)):
+        precompile(collect(cls))
+    results = {}
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count(), initializer=warm_worker) as pool:
+        futures = {}
+        for value in values:
+            label = f"{value:g}deg" if degrees else f"{value:g}"
+            params = {param: math.radians(value) if degrees else value}
+            name = output_name(scene, param, label)
+            options = {
+                "output_file": name,
+                # combine_files writes its list next to the partials; jobs of the same
+                # scene would otherwise share (and race on) one directory
+                "partial_movie_dir": f"{{media_dir}}/videos/{{module_name}}/{{quality}}/partial_movie_files/{name}",
+            }
+            future = pool.submit(render_scene, module, scene, quality, options, params=params)
+            futures[future] = label
+        for future in as_completed(futures):
+            label = futures[future]
+            try:
+                results[label] = future.result()
+            except Exception as e:
+                results[label] = {"error": repr(e)}
+            print(f"{param}={label}: {results[label].get('output', results[label].get('error'))}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a scene across many values of one of its parameters.")
+    parser.add_argument("scene")
+    parser.add_argument("values", nargs="+", type=float)
+    parser.add_argument("--param", help="constructor argument to sweep (default: the first one)")
+    parser.add_argument("--degrees", action="store_true", help="values are degrees, passed on as radians")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="h")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: one per core)")
+    args = parser.parse_args()
+
+    modules = {name: module for module, name in discover()}
+    if args.scene not in modules:
+        parser.error(f"unknown scene {args.scene}")
+    param = args.param or default_param(scene_class(modules[args.scene], args.scene))
+    if param is None:
+        parser.error(f"{args.scene} takes no parameters")
+    results = sweep(modules[args.scene], args.scene, param, args.values, args.quality, args.jobs, args.degrees)
+    if any("error" in result for result in results.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# compiles every Tex/MathTex string of a scene in one LaTeX run before the scene is built
+import ast
+import inspect
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import textwrap
+from pathlib import Path
+
+from manim import config
+from manim.mobject.text.tex_mobject import SingleStringMathTex
+from manim.utils.tex_file_writing import tex_hash
+
+from rendering import STATE_DIR
+from rendering.cache import dependencies
+
+TEX_DIR = STATE_DIR / "tex"
+
+# constructor name -> (tex environment, separator used to join the arguments)
+TEX_CLASSES = {
+    "Tex": ("center", ""),
+    "MathTex": ("align*", " "),
+    "Matrix": ("align*", " "),
+}
+
+
+def _literal(node):
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError):
+        return None
+
+
+def _call_name(node):
+    if isinstance(node.func, ast.Name):
+        return node.func.id
+    if isinstance(node.func, ast.Attribute):
+        return node.func.attr
+    return None
+
+
+def _expressions(call):
+    name = _call_name(call)
+    environment, separator = TEX_CLASSES[name]
+    kwargs = {kw.arg: _literal(kw.value) for kw in call.keywords if kw.arg}
+    environment = kwargs.get("tex_environment") or environment
+    separator = kwargs.get("arg_separator", separator)
+    args = [_literal(arg) for arg in call.args]
+    if name == "Matrix":
+        # every entry of a literal matrix becomes its own MathTex
+        rows = args[0] if args and isinstance(args[0], list) else []
+        strings = [str(entry) for row in rows if isinstance(row, list) for entry in row]
+        return [(s, environment) for s in strings]
+    if not args or not all(isinstance(arg, str) for arg in args):
+        return []
+    joined = separator.join(args)
+    if "{{" in joined:
+        # manim splits double braces into separate strings, leave those to it
+        return []
+    # MathTex also compiles each argument on its own to find its glyphs
+    strings = [joined] + (args if len(args) > 1 else [])
+    return [(s, environment) for s in strings]
+
+
+def collect(scene_class):
+    # every Tex/MathTex/Matrix built from literal strings in the scene and its helpers
+    found = []
+    for obj in dependencies(scene_class):
+        tree = ast.parse(textwrap.dedent(inspect.getsource(obj)))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Call) and _call_name(node) in TEX_CLASSES:
+                for item in _expressions(node):
+                    if item not in found:
+                        found.append(item)
+    return found
+
+
+def _modified_expression(tex_string):
+    # the same clean-up SingleStringMathTex applies before compiling
+    return SingleStringMathTex._get_modified_expression(
+        object.__new__(SingleStringMathTex), tex_string
+    )
+
+
+def _batch_document(template, expressions):
+    documentclass = re.sub(
+        r"\\documentclass\[([^\]]*)\]\{standalone\}",
+        r"\\documentclass[\1,multi]{standalone}",
+        template.documentclass,
+    )
+    pages = []
+    for expression, environment in expressions:
+        begin, end = template._texcode_for_environment(environment)
+        pages.append(f"\\begin{{standalone}}\n{begin}\n{expression}\n{end}\n\\end{{standalone}}")
+    return "\n".join([
+        documentclass,
+        template.preamble,
+        "\\begin{document}",
+        template.post_doc_commands,
+        *pages,
+        "\\end{document}",
+    ])
+
+
+def _compile_command(template, tex_file):
+    output = template.output_format
+    if template.tex_compiler == "xelatex":
+        flags = ["-no-pdf"] if output == ".xdv" else []
+    else:
+        flags = [f"-output-format={output[1:]}"]
+    return [
+        template.tex_compiler,
+        *flags,
+        "-interaction=batchmode",
+        "-halt-on-error",
+        f"-output-directory={tex_file.parent}",
+        str(tex_file),
+    ]
+
+
+def precompile(expressions, tex_template=None):
+    template = tex_template or config["tex_template"]
+    if "{standalone}" not in template.documentclass:
+        return 0
+    tex_dir = config.get_dir("tex_dir")
+    tex_dir.mkdir(parents=True, exist_ok=True)
+
+    missing = {}
+    for tex_string, environment in expressions:
+        expression = _modified_expression(tex_string)
+        code = template.get_texcode_for_expression_in_env(expression, environment)
+        name = tex_hash(code)
+        if not (tex_dir / f"{name}.svg").exists():
+            missing.setdefault(name, (expression, environment))
+    if not missing:
+        return 0
+
+    with tempfile.TemporaryDirectory(dir=tex_dir) as work:
+        batch = Path(work) / "batch.tex"
+        batch.write_text(_batch_document(template, list(missing.values())), encoding="utf-8")
+        compiled = subprocess.run(
+            _compile_command(template, batch), cwd=work, stdout=subprocess.DEVNULL,
+        )
+        if compiled.returncode:
+            # manim compiles them one by one and reports the broken one
+            return 0
+        dvi = batch.with_suffix(template.output_format)
+        subprocess.run(
+            [
+                "dvisvgm",
+                *(["--pdf"] if template.output_format == ".pdf" else []),
+                "--page=1-",
+                "-n",
+                "-v", "0",
+                "-o", str(Path(work) / "page-%p.svg"),
+                str(dvi),
+            ],
+            stdout=subprocess.DEVNULL,
+        )
+        pages = {int(p.stem.split("-")[1]): p for p in Path(work).glob("page-*.svg")}
+        for page, name in enumerate(missing, start=1):
+            if page not in pages:
+                continue
+            # svg first: a dvi without its svg would make dvisvgm convert page 1 of the batch
+            os.replace(pages[page], tex_dir / f"{name}.svg")
+            # compile_tex only checks that the dvi exists, so each one points at the batch
+            _link(dvi, tex_dir / f"{name}{template.output_format}")
+    return len(missing)
+
+
+def _link(source, target):
+    try:
+        os.link(source, target)
+    except FileExistsError:
+        pass
+    except OSError:
+        shutil.copyfile(source, target)
@@ -0,0 +1,166 @@
+# dry runs of a scene that record where every play() starts, how long it lasts
+# and what the scene looks like right before and after it
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+from manim import tempconfig
+from manim.mobject.text import tex_mobject
+
+from rendering import STATE_DIR
+from rendering.render import scene_settings
+from rendering.scenes import discover, scene_class
+from rendering.tex import collect, precompile
+
+PLACEHOLDER_DIR = STATE_DIR / "placeholders"
+
+
+# what a mobject looks like besides its points; not every mobject type has all of them
+STYLE = ("fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "stroke_width", "z_index")
+
+
+def state_digest(scene):
+    digest = hashlib.sha256()
+    for mobject in scene.get_mobject_family_members():
+        digest.update(type(mobject).__name__.encode())
+        for values in (mobject.points, *(getattr(mobject, name, 0) for name in STYLE)):
+            # + 0.0 folds -0.0 into 0.0
+            digest.update((np.round(np.asarray(values, dtype=float), 6) + 0.0).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def record_plays(scene, plays):
+    renderer = scene.renderer
+    play = renderer.play
+
+    def recording_play(scene, *args, **kwargs):
+        entry = {"index": len(plays), "start": renderer.time, "state": state_digest(scene)}
+        plays.append(entry)
+        play(scene, *args, **kwargs)
+        # where the play left the scene: edits to the play itself show up here, and the
+        # last entry's is the final state of the scene
+        entry["end"] = state_digest(scene)
+        entry["duration"] = scene.duration
+        entry["animations"] = [type(animation).__name__ for animation in scene.animations]
+
+    renderer.play = recording_play
+
+
+def placeholder_svg(expression, environment=None, tex_template=None):
+    # a row of boxes, one per character, so code that indexes into glyphs still finds them
+    count = max(len(expression.strip()), 1)
+    path = PLACEHOLDER_DIR / f"{count}.svg"
+    if not path.exists():
+        PLACEHOLDER_DIR.mkdir(parents=True, exist_ok=True)
+        boxes = "".join(f'<rect x="{10 * i}" y="0" width="8" height="10"/>' for i in range(count))
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {10 * count} 10">{boxes}</svg>'
+        )
+        os.replace(temporary, path)
+    return path
+
+
+@contextmanager
+def stubbed_tex():
+    original = tex_mobject.tex_to_svg_file
+    tex_mobject.tex_to_svg_file = placeholder_svg
+    try:
+        yield
+    finally:
+        tex_mobject.tex_to_svg_file = original
+
+
+def probe(module_name, scene_name, quality="h", stub=False):
+    # construct() runs with every play skipped, so nothing but the last frame of
+    # each play() is ever interpolated; stub=True also replaces LaTeX with
+    # placeholders and skips rasterizing those frames, for when only the timing matters
+    cls = scene_class(module_name, scene_name)
+    plays = []
+    with tempconfig({**scene_settings(module_name, quality), "dry_run": True}):
+        if not stub:
+            precompile(collect(cls))
+        with stubbed_tex() if stub else nullcontext():
+            # not cls(skip_animations=True): parameterized scenes have their own __init__
+            scene = cls()
+            # update_skipping_status resets to the original status on every play
+            scene.renderer._original_skipping_status = scene.renderer.skip_animations = True
+            if stub:
+                scene.renderer.update_frame = lambda *args, **kwargs: None
+            record_plays(scene, plays)
+            scene.render()
+    return plays
+
+
+def timestamp(seconds):
+    # the same m:ss the scenes use in their comments
+    return f"{int(seconds // 60)}:{seconds % 60:04.1f}"
+
+
+def timeline(scenes, quality="l"):
+    result = {}
+    for module, name in scenes:
+        try:
+            plays = probe(module, name, quality, stub=True)
+        except Exception as e:
+            result[name] = {"module": module, "error": repr(e)}
+            continue
+        result[name] = {
+            "module": module,
+            "duration": sum(play["duration"] for play in plays),
+            "plays": [
+                {
+                    "index": play["index"],
+                    "start": play["start"],
+                    "timestamp": timestamp(play["start"]),
+                    "duration": play["duration"],
+                    "animations": play["animations"],
+                }
+                for play in plays
+            ],
+        }
+    return result
+
+
+def write_csv(result, out):
+    writer = csv.writer(out)
+    writer.writerow(["scene", "index", "start", "timestamp", "duration", "animations"])
+    for name, scene in result.items():
+        for play in scene.get("plays", []):
+            writer.writerow([
+                name, play["index"], f"{play['start']:.3f}", play["timestamp"],
+                f"{play['duration']:.3f}", "+".join(play["animations"]),
+            ])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time every play()/wait() of every scene without rendering anything."
+    )
+    parser.add_argument("scenes", nargs="*", help="only these scene classes")
+    parser.add_argument("--csv", action="store_true", help="write csv instead of json")
+    parser.add_argument("-o", "--output", type=argparse.FileType("w"), default=sys.stdout)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    scenes = [s for s in discover() if not args.scenes or s[1] in args.scenes]
+    result = timeline(scenes)
+    if args.csv:
+        write_csv(result, args.output)
+    else:
+        json.dump(result, args.output, indent=2)
+        args.output.write("\n")
+    for name, scene in result.items():
+        if "error" in scene:
+            print(f"{name}: {scene['error']}", file=sys.stderr)
+    print(f"{len(scenes)} scenes in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# plays ValueTracker moves from arrays sampled for every frame of the play() call up front
+import numpy as np
+from manim import config
+from manim.animation.animation import Animation
+from manim.mobject.mobject import Group
+from manim.utils.rate_functions import linear
+
+from rendering.reactive import VectorBinding
+
+
+def sample(rate_func, alphas):
+    # most rate functions are plain numpy arithmetic; the ones guarded by
+    # unit_interval/zero compare a scalar and get evaluated point by point
+    try:
+        eased = np.asarray(rate_func(alphas), dtype=float)
+    except (TypeError, ValueError):
+        eased = None
+    if eased is None or eased.shape != alphas.shape:
+        eased = np.fromiter((rate_func(alpha) for alpha in alphas), float, len(alphas))
+    return eased
+
+
+class Trajectory(Animation):
+    # Trajectory({x: 1.5, y: 1.5}) is x.animate.set_value(1.5), y.animate.set_value(1.5)
+    # plus every follow() binding in the scene that reads x or y, computed in one pass
+    def __init__(self, targets, **kwargs):
+        self.targets = dict(targets)
+        self.scene = None
+        super().__init__(Group(*self.targets), **kwargs)
+
+    def _setup_scene(self, scene):
+        super()._setup_scene(scene)
+        self.scene = scene
+
+    def begin(self):
+        run_time = self.get_run_time()
+        # the same frame times Scene.play_internal steps through
+        times = np.append(np.arange(0, run_time, 1 / config.frame_rate), run_time)
+        self.alphas = times / run_time
+        eased = sample(self.rate_func, self.alphas)
+        self.tracks = {
+            tracker: tracker.get_value() + (end - tracker.get_value()) * eased
+            for tracker, end in self.targets.items()
+        }
+        self.tables = []
+        if self.scene is not None:
+            for binding in self.bindings():
+                arrays = [
+                    self.tracks.get(t, np.full(len(eased), t.get_value())) for t in binding.trackers
+                ]
+                self.tables.append((binding, arrays, binding.geometry(*arrays)))
+        super().begin()
+
+    def bindings(self):
+        found = []
+        for mobject in self.scene.get_mobject_family_members():
+            for updater in mobject.updaters:
+                if (
+                    isinstance(updater, VectorBinding)
+                    and updater not in found
+                    and any(t in self.tracks for t in updater.trackers)
+                ):
+                    found.append(updater)
+        return found
+
+    def interpolate_mobject(self, alpha):
+        frame = min(np.searchsorted(self.alphas, alpha - 1e-9), len(self.alphas) - 1)
+        for tracker, values in self.tracks.items():
+            tracker.set_value(values[frame])
+        for binding, arrays, rows in self.tables:
+            binding.apply(binding.mobject, rows[frame])
+            # already applied, the scene's updater pass sees nothing new
+            binding.values = tuple(array[frame] for array in arrays)
+
+
+class PoseTrack(Animation):
+    # drives a mobject through a table of (x, y, heading) poses, one row per simulation
+    # step, resampled to the play() call's frames in begin; each frame is then one
+    # rotation and shift of the starting points, no trig left for the frame loop.
+    # The mobject has to be drawn at the table's first pose when the play starts.
+    def __init__(self, mobject, poses, rate_func=linear, **kwargs):
+        self.poses = np.asarray(poses, dtype=float)
+        super().__init__(mobject, rate_func=rate_func, **kwargs)
+
+    def begin(self):
+        run_time = self.get_run_time()
+        times = np.append(np.arange(0, run_time, 1 / config.frame_rate), run_time)
+        self.alphas = times / run_time
+        eased = sample(self.rate_func, self.alphas)
+        steps = np.linspace(0, 1, len(self.poses))
+        x, y, heading = (np.interp(eased, steps, self.poses[:, i]) for i in range(3))
+        turned = heading - self.poses[0, 2]
+        c, s = np.cos(turned), np.sin(turned)
+        # row vectors times the transpose: [[c, s, 0], [-s, c, 0], [0, 0, 1]]
+        self.rotations = np.zeros((len(eased), 3, 3))
+        self.rotations[:, 0, 0], self.rotations[:, 0, 1] = c, s
+        self.rotations[:, 1, 0], self.rotations[:, 1, 1] = -s, c
+        self.rotations[:, 2, 2] = 1
+        self.offsets = np.stack([x, y, np.zeros_like(x)], axis=-1)
+        self.leaves = None
+        super().begin()
+        pivot = np.array([*self.poses[0, :2], 0])
+        self.leaves = [
+            (mob, start.points - pivot)
+            for mob, start in zip(self.mobject.get_family(), self.starting_mobject.get_family())
+            if len(start.points)
+        ]
+
+    def interpolate_mobject(self, alpha):
+        leaves = self.leaves
+        if leaves is None:
+            # the interpolate(0) inside Animation.begin; the mobject is still at pose 0
+            return
+        frame = min(np.searchsorted(self.alphas, alpha - 1e-9), len(self.alphas) - 1)
+        rotation, offset = self.rotations[frame], self.offsets[frame]
+        for mob, relative in leaves:
+            if mob.points.shape != relative.shape:
+                mob.points = np.empty_like(relative)
+            np.matmul(relative, rotation, out=mob.points)
+            mob.points += offset
@@ -0,0 +1,199 @@
+# Transform with its point alignment memoized in the geometry store and its frames drawn
+# by one lerp over preallocated buffers that every submobject holds a view into
+import hashlib
+
+import numpy as np
+from manim import config
+from manim.animation.animation import Animation
+from manim.animation.transform import Transform
+from manim.constants import RendererType
+from manim.mobject.types.vectorized_mobject import VMobject
+from manim.scene.scene import Scene
+from manim.utils.bezier import interpolate
+
+from rendering import geometry
+
+ARRAYS = ("points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "sheen_direction")
+SCALARS = ("stroke_width", "background_stroke_width", "sheen_factor")
+
+
+def leaf_digest(mob, digests):
+    # digests, while a play's animations begin, holds what every leaf hashed to
+    entry = digests.get(id(mob)) if digests is not None else None
+    if entry is None:
+        entry = (mob, hashlib.sha256(np.ascontiguousarray(mob.points).tobytes()).digest())
+        if digests is not None:
+            digests[id(mob)] = entry
+    return entry[1]
+
+
+def family_digest(*mobjects, digests=None):
+    digest = hashlib.sha256()
+    for mobject in mobjects:
+        for mob in mobject.get_family():
+            digest.update(f"{type(mob).__name__}:{len(mob.submobjects)}:{mob.points.shape}".encode())
+            digest.update(leaf_digest(mob, digests))
+    return digest.digest()
+
+
+class Alignments:
+    # What VMobject.align_points made of each pair of leaves in one Transform.begin, in
+    # call order. The calls are replayed from the store while their inputs match what
+    # was recorded; anything else aligns for real and the entry isn't trusted.
+
+    current = None
+    # Scene.begin_animations runs every begin of a play back to back, so a leaf that
+    # several Transforms share (a common target, a group and its parts) is hashed once.
+    # A Transform drops its own mobject's leaves once it has aligned and moved them.
+    digests = None
+
+    def __init__(self, store, key):
+        self.store = store
+        self.key = key
+        loaded = store.load(key)
+        self.arrays, self.counts = loaded if loaded else ([], [])
+        self.hit = loaded is not None
+        self.recorded = []
+        self.index = 0
+        self.valid = True
+
+    def align(self, original, mob, other):
+        mob.align_rgbas(other)
+        counts = [len(mob.points), len(other.points)]
+        if counts[0] == counts[1]:
+            return mob
+        if self.hit and self.valid and self.index < len(self.counts) and self.counts[self.index] == counts:
+            mob.points, other.points = self.arrays[2 * self.index:2 * self.index + 2]
+            self.index += 1
+            return mob
+        self.valid = False
+        original(mob, other)
+        self.recorded.append((counts, mob.points, other.points))
+        return mob
+
+    def save(self):
+        if self.hit or not self.recorded:
+            return
+        self.store.save(
+            self.key,
+            [points for _, *pair in self.recorded for points in pair],
+            [counts for counts, *_ in self.recorded],
+        )
+
+
+class Lerp:
+    # every frame of a straight, lag-free Transform of VMobjects as a handful of numpy
+    # calls into buffers allocated once, exactly (1 - alpha) * start + alpha * end
+
+    @classmethod
+    def build(cls, animation):
+        if (
+            type(animation).interpolate_submobject is not Transform.interpolate_submobject
+            or animation.lag_ratio
+            or animation.path_func is not interpolate
+        ):
+            return None
+        families = list(animation.get_all_families_zipped())
+        if not families or not all(isinstance(mob, VMobject) for family in families for mob in family):
+            return None
+        # their updaters would move the ends while the buffers hold a snapshot
+        for end in (animation.starting_mobject, animation.target_copy):
+            if any(mob.updaters for mob in end.get_family()):
+                return None
+        mobs, starts, ends = zip(*families)
+        for name in ARRAYS:
+            if any(np.shape(getattr(s, name)) != np.shape(getattr(e, name)) for s, e in zip(starts, ends)):
+                return None
+        return cls(mobs, starts, ends)
+
+    def __init__(self, mobs, starts, ends):
+        self.mobs = mobs
+        self.buffers = []
+        for name in ARRAYS:
+            start = np.concatenate([np.reshape(getattr(s, name), (-1, np.shape(getattr(s, name))[-1])) for s in starts])
+            end = np.concatenate([np.reshape(getattr(e, name), (-1, np.shape(getattr(e, name))[-1])) for e in ends])
+            out = np.empty_like(start)
+            self.buffers.append((start, end, out, np.empty_like(start)))
+            offset = 0
+            for mob, s in zip(mobs, starts):
+                shape = np.shape(getattr(s, name))
+                size = len(np.reshape(getattr(s, name), (-1, shape[-1])))
+                setattr(mob, name, out[offset:offset + size].reshape(shape))
+                offset += size
+        self.scalars = []
+        for name in SCALARS:
+            start = np.array([getattr(s, name) for s in starts], dtype=float)
+            end = np.array([getattr(e, name) for e in ends], dtype=float)
+            self.scalars.append((name, start, end, np.empty_like(start), np.empty_like(start)))
+
+    def __call__(self, alpha):
+        for start, end, out, scratch in self.buffers:
+            np.multiply(start, 1 - alpha, out=out)
+            np.multiply(end, alpha, out=scratch)
+            out += scratch
+        for name, start, end, out, scratch in self.scalars:
+            np.multiply(start, 1 - alpha, out=out)
+            np.multiply(end, alpha, out=scratch)
+            out += scratch
+            for mob, value in zip(self.mobs, out.tolist()):
+                setattr(mob, name, value)
+
+
+def install(store=None):
+    if getattr(Transform.begin, "store", None):
+        return Transform.begin.store
+    store = store or geometry.install()
+    begin, interpolate_mobject = Transform.begin, Transform.interpolate_mobject
+    begin_animations = Scene.begin_animations
+    align_points = VMobject.align_points
+
+    def aligned_points(self, vmobject):
+        if Alignments.current is None:
+            return align_points(self, vmobject)
+        return Alignments.current.align(align_points, self, vmobject)
+
+    def memoized_begin(self):
+        if config.renderer == RendererType.OPENGL:
+            return begin(self)
+        # Transform.begin, with VMobject.align_points answered from the store
+        self.target_mobject = self.create_target()
+        self.target_copy = self.target_mobject.copy()
+        # the copy hashes like the target it was just made from
+        digest = family_digest(self.mobject, self.target_mobject, digests=Alignments.digests)
+        alignments = Alignments(store, store.key("align", digest))
+        Alignments.current = alignments
+        try:
+            self.mobject.align_data(self.target_copy)
+        finally:
+            Alignments.current = None
+        alignments.save()
+        self.lerp = None
+        Animation.begin(self)
+        if Alignments.digests is not None:
+            for mob in self.mobject.get_family():
+                Alignments.digests.pop(id(mob), None)
+
+    def batched_interpolate_mobject(self, alpha):
+        lerp = getattr(self, "lerp", None)
+        if lerp is None:
+            # on the interpolate(0) that Animation.begin makes, once starting_mobject exists
+            lerp = self.lerp = Lerp.build(self) or False
+        if lerp:
+            # the rate_func (and its reversal) as Animation.interpolate_submobject would get it
+            lerp(self.get_sub_alpha(alpha, 0, 1))
+        else:
+            interpolate_mobject(self, alpha)
+
+    def memoized_begin_animations(self):
+        Alignments.digests = {}
+        try:
+            begin_animations(self)
+        finally:
+            Alignments.digests = None
+
+    memoized_begin.store = store
+    Scene.begin_animations = memoized_begin_animations
+    VMobject.align_points = aligned_points
+    Transform.begin = memoized_begin
+    Transform.interpolate_mobject = batched_interpolate_mobject
+    return store
@@ -0,0 +1,73 @@
+import pytest
+
+pytest.importorskip("manim")
+
+from rendering import cache
+from rendering.cache import RenderCache, dependencies, scene_key
+
+
+def helper():
+    return 1
+
+
+class Scene:
+    def construct(self):
+        return helper()
+
+
+class Other:
+    def construct(self):
+        return 2
+
+
+def test_key_is_stable():
+    assert scene_key(Scene, {"quality": "h"}) == scene_key(Scene, {"quality": "h"})
+
+
+def test_key_depends_on_settings_and_code():
+    assert scene_key(Scene, {"quality": "h"}) != scene_key(Scene, {"quality": "l"})
+    assert scene_key(Scene, {"quality": "h"}) != scene_key(Other, {"quality": "h"})
+
+
+def test_helpers_are_dependencies():
+    assert helper in dependencies(Scene)
+    assert helper not in dependencies(Other)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = iter(range(1000))
+    monkeypatch.setattr(cache.time, "time", lambda: next(now))
+
+
+def output(tmp_path, name, size):
+    path = tmp_path / f"{name}.mp4"
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def test_evicts_least_recently_used(tmp_path, clock):
+    store = RenderCache(tmp_path / "cache")
+    store.max_bytes = 250
+    store.put("a", "A", output(tmp_path, "a", 100))
+    store.put("b", "B", output(tmp_path, "b", 100))
+    assert store.get("a", "A")
+    store.put("c", "C", output(tmp_path, "c", 100))
+    assert store.get("b", "B") is None
+    assert store.get("a", "A") and store.get("c", "C")
+    assert store.size() <= store.max_bytes
+
+
+def test_keeps_the_entry_just_put(tmp_path, clock):
+    store = RenderCache(tmp_path / "cache")
+    store.max_bytes = 50
+    store.put("a", "A", output(tmp_path, "a", 100))
+    assert store.get("a", "A")
+
+
+def test_counts_hits_and_misses(tmp_path, clock):
+    store = RenderCache(tmp_path / "cache")
+    assert store.get("a", "A") is None
+    store.put("a", "A", output(tmp_path, "a", 10))
+    store.get("a", "A")
+    assert RenderCache(tmp_path / "cache").index["scenes"]["A"] == {"hits": 1, "misses": 1}
@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("manim")
+
+from rendering.chunks import plan
+
+
+def plays(*durations):
+    return [{"index": i, "duration": d} for i, d in enumerate(durations)]
+
+
+def covered(chunks, count):
+    # contiguous ranges over every play, the last one open ended
+    indices = []
+    for first, last in chunks:
+        indices += range(first, count if last is None else last + 1)
+    return indices == list(range(count))
+
+
+def test_equal_plays_split_evenly():
+    assert plan(plays(1, 1, 1, 1), 2) == [(0, 1), (2, None)]
+
+
+def test_one_chunk():
+    assert plan(plays(1, 1, 1), 1) == [(0, None)]
+    assert plan(plays(5), 4) == [(0, None)]
+
+
+def test_first_chunk_never_stops_at_play_zero():
+    # upto_animation_number=0 would mean "no limit"
+    assert plan(plays(10, 1, 1), 2) == [(0, 1), (2, None)]
+
+
+def test_more_chunks_than_plays():
+    chunks = plan(plays(1, 1, 1), 8)
+    assert covered(chunks, 3)
+    assert len(chunks) <= 3
+
+
+def test_uneven_plays_are_covered():
+    durations = (0.5, 3, 0.1, 2, 2, 0.3, 4, 1)
+    chunks = plan(plays(*durations), 3)
+    assert covered(chunks, len(durations))
+    assert len(chunks) == 3
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from rendering.holds import HoldFileWriter
+
+
+class Recorder(HoldFileWriter):
+    # the run detection of HoldFileWriter, with the ffmpeg pipe replaced by a log
+    def __init__(self):
+        self.log = []
+
+    def open_movie_pipe(self, file_path=None, repeat=1):
+        self.log.append(("open", repeat))
+        self.pipe_open = True
+
+    def write_raw_frame(self, frame):
+        self.log.append(("frame", int(frame[0])))
+
+    def close_movie_pipe(self):
+        self.log.append(("close",))
+        self.pipe_open = False
+
+
+def play(*frames):
+    writer = Recorder()
+    writer.writing = True
+    writer.pipe_path = "partial.mp4"
+    writer.pipe_open = False
+    writer.held_frame = None
+    writer.held_count = 0
+    for frame in frames:
+        writer.write_frame(frame)
+    writer.end_animation(True)
+    return writer.log
+
+
+def frame(value):
+    return np.full(4, value, dtype=np.uint8)
+
+
+def test_leading_hold_is_looped():
+    still = frame(1)
+    assert play(still, still, still) == [("open", 3), ("frame", 1), ("close",)]
+
+
+def test_hold_after_motion_is_piped():
+    still = frame(2)
+    assert play(frame(1), still, still) == [
+        ("open", 1), ("frame", 1), ("frame", 2), ("frame", 2), ("close",),
+    ]
+
+
+def test_equal_frames_are_not_a_hold():
+    # only the very same frame object is a hold, a redrawn frame may differ anywhere
+    assert play(frame(1), frame(1)) == [("open", 1), ("frame", 1), ("frame", 1), ("close",)]
+
+
+def test_no_frames_still_writes_a_partial():
+    assert play() == [("open", 1), ("close",)]
@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import Dot, ValueTracker
+
+from rendering.reactive import Binding
+
+
+def binding(*dependencies):
+    calls = []
+    update = Binding(Dot(), dependencies, calls.append)
+    return update, calls
+
+
+def test_runs_once_until_a_tracker_moves():
+    tracker = ValueTracker(1)
+    update, calls = binding(tracker)
+    update(update.mobject)
+    update(update.mobject)
+    assert len(calls) == 1
+    tracker.set_value(2)
+    update(update.mobject)
+    assert len(calls) == 2
+
+
+def test_setting_the_same_value_is_not_a_change():
+    tracker = ValueTracker(1)
+    update, calls = binding(tracker)
+    update(update.mobject)
+    tracker.set_value(1)
+    update(update.mobject)
+    assert len(calls) == 1
+
+
+def test_a_moved_mobject_is_a_change():
+    anchor = Dot()
+    update, calls = binding(ValueTracker(0), anchor)
+    update(update.mobject)
+    anchor.shift([1, 0, 0])
+    update(update.mobject)
+    update(update.mobject)
+    assert len(calls) == 2
+
+
+def test_updates_the_original_mobject():
+    update, calls = binding(ValueTracker(0))
+    update(update.mobject.copy())
+    assert calls == [update.mobject]
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from rendering.resume import first_change
+from rendering.timeline import state_digest
+
+
+class Mob:
+    def __init__(self, color=(1, 1, 1, 1), stroke_width=4):
+        self.points = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=float)
+        self.fill_rgbas = np.array([color], dtype=float)
+        self.stroke_rgbas = np.array([color], dtype=float)
+        self.stroke_width = stroke_width
+
+
+class Scene:
+    def __init__(self, *mobjects):
+        self.mobjects = mobjects
+
+    def get_mobject_family_members(self):
+        return list(self.mobjects)
+
+
+def plays(*ends):
+    # one play per end state, each starting where the one before it ended
+    states = [state_digest(Scene())] + [state_digest(end) for end in ends]
+    return [
+        {"index": i, "state": states[i], "end": states[i + 1], "duration": 1, "animations": ["Wait"]}
+        for i in range(len(ends))
+    ]
+
+
+def test_digest_sees_style():
+    assert state_digest(Scene(Mob())) == state_digest(Scene(Mob()))
+    assert state_digest(Scene(Mob())) != state_digest(Scene(Mob(color=(1, 0, 0, 1))))
+    assert state_digest(Scene(Mob())) != state_digest(Scene(Mob(color=(1, 1, 1, 0.5))))
+    assert state_digest(Scene(Mob())) != state_digest(Scene(Mob(stroke_width=2)))
+
+
+def test_digest_sees_geometry_and_order():
+    moved = Mob()
+    moved.points = moved.points + 1e-3
+    assert state_digest(Scene(Mob())) != state_digest(Scene(moved))
+    raised = Mob()
+    raised.z_index = 1
+    assert state_digest(Scene(Mob())) != state_digest(Scene(raised))
+    a, b = Mob(), Mob(color=(1, 0, 0, 1))
+    assert state_digest(Scene(a, b)) != state_digest(Scene(b, a))
+
+
+def test_digest_ignores_float_noise():
+    noisy = Mob()
+    noisy.points = noisy.points + 1e-9
+    noisy.points[0, 0] = -0.0
+    assert state_digest(Scene(Mob())) == state_digest(Scene(noisy))
+
+
+def test_colour_edit_to_a_play_rerenders_it():
+    old = plays(Scene(Mob()), Scene(Mob()), Scene(Mob()))
+    new = plays(Scene(Mob()), Scene(Mob(color=(1, 0, 0, 1))), Scene(Mob(color=(1, 0, 0, 1))))
+    assert first_change(old, new) == 1
+
+
+def test_colour_edit_to_the_last_play_rerenders_it():
+    old = plays(Scene(Mob()), Scene(Mob()))
+    new = plays(Scene(Mob()), Scene(Mob(color=(0, 0, 1, 1))))
+    assert first_change(old, new) == 1
+
+
+def test_unchanged():
+    assert first_change(plays(Scene(Mob())), plays(Scene(Mob()))) is None
+
+
+def test_manifest_without_end_restarts_a_play_early():
+    old = [{k: v for k, v in play.items() if k != "end"} for play in plays(Scene(Mob()), Scene(Mob()))]
+    new = plays(Scene(Mob(color=(1, 0, 0, 1))), Scene(Mob(color=(1, 0, 0, 1))))
+    assert first_change(old, new) == 0
@@ -2,6 +2,11 @@ import math
 from math import cos, sin, radians
 import numpy as np
 from manim import *
+import drive
+import gps
+from rendering.animated import AnimatedImageMobject
+from rendering.reactive import bind, follow, redraw, set_line
+from rendering.trajectory import PoseTrack, Trajectory
 
 
 class OpeningQuote(Scene):
@@ -64,7 +69,7 @@ class Calculus(Scene):
         x = ValueTracker(7)
         dx = ValueTracker(3)
 
-        secant = always_redraw(
+        secant = redraw(
             lambda: axes.get_secant_slope_group(
                 x=x.get_value(),
                 graph=func,
@@ -75,17 +80,16 @@ class Calculus(Scene):
                 dy_label="dy",
                 secant_line_color=GREEN,
                 secant_line_length=8
-            )
+            ),
+            [x, dx]
         )
-        dot1 = always_redraw(
-            lambda: Dot()
-            .scale(0.7)
-            .move_to(axes.c2p(x.get_value(),func.underlying_function(x.get_value())))
+        dot1 = bind(
+            Dot().scale(0.7), [x, axes],
+            lambda m: m.move_to(axes.c2p(x.get_value(),func.underlying_function(x.get_value())))
         )
-        dot2 = always_redraw(
-            lambda: Dot()
-            .scale(0.7)
-            .move_to(axes.c2p(
+        dot2 = bind(
+            Dot().scale(0.7), [x, dx, axes],
+            lambda m: m.move_to(axes.c2p(
                 x.get_value() + dx.get_value(),
                 func.underlying_function(x.get_value() + dx.get_value())
             )
@@ -111,7 +115,13 @@ class Holonomic(Scene):
         self.play(AnimationGroup(Create(VGroup(car, robot), run_time=1)))
         self.play(Write(car_label), Write(robot_label))
         self.play(AnimationGroup(GrowArrow(car_direction), GrowArrow(robot_direction)))
-        self.play(Rotate(robot_direction, 2*PI, about_point=RIGHT*2),run_time=2)
+        # a full turn while the stick sweeps around with it: the robot circles back to
+        # where it started, its path never caring which way it faces
+        dt = 1/config.frame_rate
+        t = np.arange(0, 2, dt)
+        stick = 0.6*np.stack([-np.sin(PI*t), np.cos(PI*t)], axis=-1)
+        poses = drive.simulate(stick, dt, turn=PI, start=(2, 0), speed=2)
+        self.play(PoseTrack(VGroup(robot, robot_direction), poses), run_time=2)
         self.wait(1)
 
 
@@ -143,42 +153,63 @@ class ThreeThings(Scene):
 
 class RobotAndFieldCentric(Scene):
     def construct(self):
+        dt = 1/config.frame_rate
         robot = Square()
         robot_forwards = Arrow(ORIGIN, 2*LEFT, color=PINK)
         robot_label = Tex("Front of\\\\the robot").next_to(robot_forwards,LEFT,buff=0.5)
         forwards = Arrow(ORIGIN, 2*UP, color=YELLOW)
         title = Tex("Robot Centric")
         title.to_edge(UP)
+
+        def drive_around(seconds, stick, field_centric):
+            # one full turn while driving, the front starting out LEFT; the pushes
+            # cancel over the turn, so the robot ends where it started
+            t = np.arange(0, seconds, dt)
+            return drive.simulate(
+                stick(t, seconds), dt, turn=2*PI/seconds, heading=PI/2,
+                field_centric=field_centric
+            )
+
+        # robot centric: "forwards" turns with the robot, so it drives in a circle
+        robot_centric = drive_around(6, lambda t, s: np.tile([0, 0.6], (len(t), 1)), False)
+        # field centric: up and then back down, straight along the field however it turns
+        field_centric = drive_around(
+            8, lambda t, s: np.where((t < s/2)[:, None], [0, 0.3], [0, -0.3]), True
+        )
+        # the field's forwards only rides along, it never turns
+        riding = field_centric * [1, 1, 0] + [0, 0, PI/2]
+
         self.add(robot, robot_forwards, robot_label, title)
         self.wait(10)
         self.play(Indicate(robot_forwards))
-        self.wait(6)
+        self.play(PoseTrack(VGroup(robot, robot_forwards), robot_centric), run_time=6)
         self.play(Transform(title,Tex("Field Centric").to_edge(UP)))
         self.play(FadeOut(robot_forwards), FadeIn(forwards))
         self.wait()
         self.play(Indicate(forwards))
-        self.wait(8)
+        self.play(PoseTrack(robot, field_centric), PoseTrack(forwards, riding), run_time=8)
 
 
 class DeltaArmDemo(Scene):
     def construct(self):
         pos = ValueTracker(3)
-        a = always_redraw(
-            lambda: DashedLine(LEFT, pos.get_value()*RIGHT, color=RED)
-        )
-        b = always_redraw(
-            lambda: Line(LEFT, LEFT
-                         + math.sqrt(20-(1+pos.get_value())**2)*UP,
-                         color=BLUE)
-        )
-        c = always_redraw(
-            lambda: Line(LEFT+math.sqrt(20-(1+pos.get_value())**2)*UP,
-                         pos.get_value()*RIGHT, color=GREEN)
+
+        def corners(pos):
+            # LEFT, the top of the arm and the point on the rail, for every sampled pos
+            top = LEFT + np.sqrt(20-(1+pos)**2)[:, None]*UP
+            return np.stack([np.broadcast_to(LEFT, top.shape), top, pos[:, None]*RIGHT], axis=1)
+
+        # the dashes are stretched in place rather than laid out again every frame
+        a = follow(
+            DashedLine(LEFT, pos.get_value()*RIGHT, color=RED), [pos], corners,
+            lambda m, p: m.put_start_and_end_on(p[0], p[2])
         )
+        b = follow(Line(color=BLUE), [pos], corners, lambda m, p: set_line(m, p[0], p[1]))
+        c = follow(Line(color=GREEN), [pos], corners, lambda m, p: set_line(m, p[1], p[2]))
         a_label, b_label, c_label = (
-            always_redraw(lambda: MathTex("a", color=RED).next_to(a, DOWN)),
-            always_redraw(lambda: MathTex("b", color=BLUE).next_to(b, LEFT)),
-            always_redraw(lambda: MathTex("c", color=GREEN).next_to(c, UR, buff=-1))
+            bind(MathTex("a", color=RED), [a], lambda m: m.next_to(a, DOWN)),
+            bind(MathTex("b", color=BLUE), [b], lambda m: m.next_to(b, LEFT)),
+            bind(MathTex("c", color=GREEN), [c], lambda m: m.next_to(c, UR, buff=-1))
         )
 
         h = Line(LEFT, LEFT+DOWN*3)
@@ -210,24 +241,24 @@ class DeltaArmDemo(Scene):
         oe0 = originalEq.copy()
         intermediates = VGroup(a0,b0,c0,oe0)
 
-        p = always_redraw(lambda: Dot(pos.get_value()*RIGHT)) #point where a and c intersect
+        p = follow(Dot(), [pos], corners, lambda m, p: m.move_to(p[2])) #point where a and c intersect
         self.play(Create(a),Create(b),Create(c)) # 0:00
         self.play(Write(a_label), Write(b_label), Write(c_label)) # 0:01
         self.play(Create(p)) # 0:02
         self.wait() # 0:03
-        self.play(pos.animate.set_value(2)) # 0:04
+        self.play(Trajectory({pos: 2})) # 0:04
         self.wait() # 0:05
-        self.play(pos.animate.set_value(3.2)) # 0:06
+        self.play(Trajectory({pos: 3.2})) # 0:06
         self.wait(2) # 0:08
         self.play(Indicate(b), Indicate(b_label)) # 0:09
         self.wait() # 0:10
         self.play(Indicate(a), Indicate(a_label)) # 0:11
         self.wait(2) # 0:13
-        self.play(pos.animate.set_value(2.8)) # 0:14
+        self.play(Trajectory({pos: 2.8})) # 0:14
         self.wait() # 0:15
-        self.play(pos.animate.set_value(1.9)) # 0:16
+        self.play(Trajectory({pos: 1.9})) # 0:16
         self.wait() # 0:17
-        self.play(pos.animate.set_value(3)) # 0:18
+        self.play(Trajectory({pos: 3})) # 0:18
         self.wait() #0:19
         self.play(
             Write(exp),
@@ -250,40 +281,38 @@ class DeltaSystemOfEquations(Scene):
     def construct(self):
         radius = 3
         c = Circle(radius=radius, color=WHITE)
-        x = ValueTracker(0)
-        y = ValueTracker(0)
+        bases = gps.ring(3, radius)
+        # the three arm lengths are what the robot controls; the point is solved from them
+        lengths = [ValueTracker(r) for r in gps.distances(ORIGIN, bases)]
 
-        arm1 = always_redraw(
-            lambda: DashedLine(RIGHT*cos(radians(90))*radius+UP*sin(radians(90))*radius,
-                               x.get_value() * RIGHT + y.get_value() * UP,
-                               color=RED)
-        )
-        arm2 = always_redraw(
-            lambda: DashedLine(RIGHT*cos(radians(210))*radius+UP*sin(radians(210))*radius,
-                               x.get_value() * RIGHT + y.get_value() * UP,
-                               color=RED)
-        )
-        arm3 = always_redraw(
-            lambda: DashedLine(RIGHT * cos(radians(330)) * radius + UP*sin(radians(330)) * radius,
-                               x.get_value() * RIGHT + y.get_value() * UP,
-                               color=RED)
-        )
-        d = always_redraw(
-            lambda: Dot(RIGHT*x.get_value()+UP*y.get_value(), color=WHITE)
-        )
+        def point(*lengths):
+            return gps.trilaterate(bases, np.stack(lengths, axis=-1))
+
+        def reach(target):
+            # ease every arm to its length at the target, the point follows a computed path
+            return Trajectory(dict(zip(lengths, gps.distances(target, bases))))
+
+        def arm(base):
+            return follow(
+                DashedLine(base, ORIGIN, color=RED), lengths, point,
+                lambda m, p: m.put_start_and_end_on(base, p)
+            )
+
+        arm1, arm2, arm3 = (arm(base) for base in bases)
+        d = follow(Dot(color=WHITE), lengths, point, lambda m, p: m.move_to(p))
 
         self.play(Create(c), Create(arm1), Create(arm2), Create(arm3))
         self.play(Create(d))
         self.wait()
-        self.play(x.animate.set_value(1.5), y.animate.set_value(1.5), run_time=2)
+        self.play(reach(1.5*RIGHT + 1.5*UP), run_time=2)
         self.wait()
-        self.play(x.animate.set_value(-0.3), y.animate.set_value(-1), run_time=1)
+        self.play(reach(-0.3*RIGHT - UP), run_time=1)
         self.wait()
-        self.play(x.animate.set_value(-1), y.animate.set_value(0))
+        self.play(reach(LEFT))
         self.wait()
-        self.play(x.animate.set_value(0), y.animate.set_value(1))
+        self.play(reach(UP))
         self.wait()
-        self.play(x.animate.set_value(-2),y.animate.set_value(2.1), run_time=2)
+        self.play(reach(-2*RIGHT + 2.1*UP), run_time=2)
         self.wait()
 
 
@@ -299,8 +328,11 @@ class LawOfCosines(Scene):
     def construct(self):
         radius = 2
         earth = Circle(radius, color=BLUE_D)
-        satellite_pos = 0.5*RIGHT+3*UP
-        receiver_pos = sin(radians(30))*UP*radius+cos(radians(30))*RIGHT*radius
+        # what the receiver knows: where it is, the satellite's orbit radius and its range,
+        # which place the satellite L further around the earth
+        receiver_angle, orbit_radius, distance = radians(30), 3.04, 2.35
+        receiver_pos = gps.polar(radius, receiver_angle)
+        satellite_pos = gps.polar(orbit_radius, receiver_angle + gps.central_angle(radius, orbit_radius, distance))
         satellite = Dot(satellite_pos)
         earth_center = Dot(ORIGIN)
         receiver = Dot(receiver_pos, color="#fc2c03")
@@ -346,14 +378,17 @@ class LawOfCosines(Scene):
 
 class ToF(Scene):
     def construct(self):
+        # an echo 0.04s after the ping: 6,000 km away, drawn a unit per 1,000 km
+        speed = round(gps.SPEED_OF_LIGHT, -5)
+        distance = gps.flight_distance(0.04, speed) / 1000
         sat = Square(0.5, color=GRAY).shift(LEFT*3)
-        earth = Circle(1, color=BLUE).shift(RIGHT*3)
+        earth = Circle(1, color=BLUE).shift(LEFT*3 + distance*RIGHT)
         l1 = Line(sat.get_center(), earth.get_center())
         msg = Dot(sat.get_center()).set_color(ORANGE)
         visuals = VGroup(msg, sat, earth, l1)
         eq1 = MathTex(r"d=\frac{1}{2}rt")
-        eq2 = MathTex(r"d=\frac{1}{2}(300,000)t")
-        eq3 = MathTex(r"d=\frac{1}{2}(300,000)\Delta t")
+        eq2 = MathTex(rf"d=\frac{{1}}{{2}}({speed:,.0f})t")
+        eq3 = MathTex(rf"d=\frac{{1}}{{2}}({speed:,.0f})\Delta t")
         title = Tex("Radio Time of Flight").to_edge(UP)
         self.play(Create(visuals))
         self.wait()
@@ -415,5 +450,6 @@ class GPSTitleCard(Scene):
 class AndyBornIntro(Scene):
     def construct(self):
 
-        gps_gif = ImageMobject("./assets/GPS.gif")
-        self.play(GrowFromCenter(gps_gif))
\ No newline at end of file
+        gps_gif = AnimatedImageMobject("./assets/GPS.gif")
+        self.play(GrowFromCenter(gps_gif))
+        self.wait(gps_gif.duration)
\ No newline at end of file